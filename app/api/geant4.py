@@ -5,16 +5,42 @@ Endpoints for configuring the Geant4 installation and managing
 the connection to real Geant4 executables.
 """
 
+from functools import lru_cache
 from typing import Optional, Dict, Any
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 
+from app.config import settings
+from app.core._pools import run_in_engine_pool
+from app.core.geant4_executor import Geant4Environment
 from app.core.simulation_engine import simulation_engine
 
 
 router = APIRouter()
 
 
+@lru_cache(maxsize=1)
+def _cached_environment(
+    install_path: Optional[str],
+    data_path: Optional[str]
+) -> Dict[str, str]:
+    """
+    Build the filtered Geant4 environment once per configuration.
+
+    The paths are process-static, so re-scanning the installation on
+    every request is wasted work. `configure_geant4` clears this cache.
+    """
+    env = Geant4Environment(
+        install_path=install_path,
+        data_path=data_path
+    ).setup()
+
+    return {
+        k: v for k, v in env.items()
+        if k.startswith(("G4", "GEANT4")) or k in ("PATH", "LD_LIBRARY_PATH")
+    }
+
+
 class Geant4Config(BaseModel):
     """Geant4 configuration request."""
     install_path: Optional[str] = Field(
@@ -44,14 +70,14 @@ class Geant4Config(BaseModel):
 async def get_geant4_status():
     """
     Get current Geant4 configuration status.
-    
+
     Returns information about:
     - Whether Geant4 is configured
     - Installation paths
     - Verification results
     - Whether real simulations can be run
     """
-    return simulation_engine.get_geant4_status()
+    return await run_in_engine_pool(simulation_engine.get_geant4_status)
 
 
 @router.post("/configure")
@@ -77,12 +103,16 @@ async def configure_geant4(config: Geant4Config):
     }
     ```
     """
-    result = simulation_engine.configure_geant4(
+    result = await run_in_engine_pool(
+        simulation_engine.configure_geant4,
         install_path=config.install_path,
         data_path=config.data_path,
         executable_path=config.executable_path
     )
-    
+
+    # Paths may have changed - rebuild the environment on next request
+    _cached_environment.cache_clear()
+
     return result
 
 
@@ -97,7 +127,7 @@ async def verify_geant4():
     - Environment variables can be set
     - Executable exists and is accessible
     """
-    status = simulation_engine.get_geant4_status()
+    status = await run_in_engine_pool(simulation_engine.get_geant4_status)
     verification = status.get("verification", {})
     
     if not verification.get("valid", False):
@@ -124,24 +154,11 @@ async def get_environment():
     
     Useful for debugging environment issues.
     """
-    from app.core.geant4_executor import Geant4Environment
-    from app.config import settings
-    
-    env = Geant4Environment(
-        install_path=settings.geant4_install_path,
-        data_path=settings.geant4_data_path
-    )
-    
-    geant4_env = env.setup()
-    
-    # Filter to only Geant4-related variables
-    g4_vars = {
-        k: v for k, v in geant4_env.items()
-        if k.startswith("G4") or k.startswith("GEANT4") or k == "PATH" or k == "LD_LIBRARY_PATH"
-    }
-    
     return {
-        "environment_variables": g4_vars,
+        "environment_variables": _cached_environment(
+            settings.geant4_install_path,
+            settings.geant4_data_path
+        ),
         "data_variables": Geant4Environment.DATA_VARS
     }
 
@@ -4,7 +4,7 @@ Geometry configuration API endpoints.
 
 from typing import List, Dict, Any
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import Response
+from fastapi.responses import Response, ORJSONResponse
 
 from app.models.geometry import DetectorGeometry, MaterialType
 from app.core.geometry_builder import (
@@ -16,73 +16,77 @@ router = APIRouter()
 
 
 @router.get("", response_model=List[str])
-@router.get("/", response_model=List[str], include_in_schema=False)
 async def list_geometries():
     """List all saved geometry configurations."""
     return geometry_builder.list_geometries()
 
 
+# The template registry is static - build the listing payload once at import.
+_TEMPLATES_LIST_RESPONSE = {
+    name: {
+        "name": geom.name,
+        "description": geom.description,
+        "volumes": len(geom.volumes)
+    }
+    for name, geom in GEOMETRY_TEMPLATES.items()
+}
+
+
 @router.get("/templates", response_model=Dict[str, Any])
 async def list_templates():
     """List available geometry templates."""
-    return {
-        name: {
-            "name": geom.name,
-            "description": geom.description,
-            "volumes": len(geom.volumes)
-        }
-        for name, geom in GEOMETRY_TEMPLATES.items()
-    }
+    return _TEMPLATES_LIST_RESPONSE
 
 
-@router.get("/templates/{template_name}", response_model=DetectorGeometry)
+@router.get("/templates/{template_name}")
 async def get_template(template_name: str):
     """Get a geometry template configuration."""
     if template_name not in GEOMETRY_TEMPLATES:
         raise HTTPException(404, f"Template '{template_name}' not found")
-    return GEOMETRY_TEMPLATES[template_name]
+    # Templates are validated at import - skip response re-validation
+    return ORJSONResponse(GEOMETRY_TEMPLATES[template_name].model_dump(mode="json"))
+
+
+# Material descriptions are static - build them (and the full response
+# payload) once at import time instead of per request.
+_MATERIAL_DESCRIPTIONS = {
+    MaterialType.VACUUM: "Perfect vacuum (galactic)",
+    MaterialType.AIR: "Standard air at STP",
+    MaterialType.WATER: "Liquid water (H2O)",
+    MaterialType.ALUMINUM: "Pure aluminum",
+    MaterialType.COPPER: "Pure copper",
+    MaterialType.LEAD: "Pure lead (common shielding)",
+    MaterialType.IRON: "Pure iron",
+    MaterialType.TUNGSTEN: "Pure tungsten",
+    MaterialType.CONCRETE: "Standard concrete",
+    MaterialType.TISSUE_SOFT: "Soft tissue (ICRP)",
+    MaterialType.BONE: "Compact bone (ICRU)",
+    MaterialType.SILICON: "Pure silicon",
+    MaterialType.GERMANIUM: "Pure germanium",
+    MaterialType.SODIUM_IODIDE: "NaI scintillator",
+    MaterialType.BGO: "BGO scintillator",
+    MaterialType.CESIUM_IODIDE: "CsI scintillator",
+    MaterialType.PLASTIC_SCINTILLATOR: "Plastic scintillator",
+}
+
+_MATERIALS_RESPONSE = [
+    {
+        "name": m.name,
+        "value": m.value,
+        "description": _MATERIAL_DESCRIPTIONS.get(m, "")
+    }
+    for m in MaterialType
+]
 
 
 @router.get("/materials")
 async def list_materials():
     """List available predefined materials."""
-    return [
-        {
-            "name": m.name,
-            "value": m.value,
-            "description": _material_description(m)
-        }
-        for m in MaterialType
-    ]
-
-
-def _material_description(mat: MaterialType) -> str:
-    """Get description for material."""
-    descriptions = {
-        MaterialType.VACUUM: "Perfect vacuum (galactic)",
-        MaterialType.AIR: "Standard air at STP",
-        MaterialType.WATER: "Liquid water (H2O)",
-        MaterialType.ALUMINUM: "Pure aluminum",
-        MaterialType.COPPER: "Pure copper",
-        MaterialType.LEAD: "Pure lead (common shielding)",
-        MaterialType.IRON: "Pure iron",
-        MaterialType.TUNGSTEN: "Pure tungsten",
-        MaterialType.CONCRETE: "Standard concrete",
-        MaterialType.TISSUE_SOFT: "Soft tissue (ICRP)",
-        MaterialType.BONE: "Compact bone (ICRU)",
-        MaterialType.SILICON: "Pure silicon",
-        MaterialType.GERMANIUM: "Pure germanium",
-        MaterialType.SODIUM_IODIDE: "NaI scintillator",
-        MaterialType.BGO: "BGO scintillator",
-        MaterialType.CESIUM_IODIDE: "CsI scintillator",
-        MaterialType.PLASTIC_SCINTILLATOR: "Plastic scintillator",
-    }
-    return descriptions.get(mat, "")
+    return _MATERIALS_RESPONSE
 
 
 @router.post("", response_model=Dict[str, str])
-@router.post("/", response_model=Dict[str, str], include_in_schema=False)
-async def create_geometry(geometry: DetectorGeometry):
+def create_geometry(geometry: DetectorGeometry):
     """
     Create and save a new geometry configuration.
     
@@ -106,17 +110,18 @@ async def create_geometry(geometry: DetectorGeometry):
     }
 
 
-@router.get("/{geometry_id}", response_model=DetectorGeometry)
-async def get_geometry(geometry_id: str):
+@router.get("/{geometry_id}")
+def get_geometry(geometry_id: str):
     """Get a saved geometry configuration."""
     geometry = geometry_builder.get_geometry(geometry_id)
     if not geometry:
         raise HTTPException(404, f"Geometry '{geometry_id}' not found")
-    return geometry
+    # Stored geometries were validated on insert - skip re-validation
+    return ORJSONResponse(geometry.model_dump(mode="json"))
 
 
 @router.delete("/{geometry_id}")
-async def delete_geometry(geometry_id: str):
+def delete_geometry(geometry_id: str):
     """Delete a saved geometry configuration."""
     if not geometry_builder.delete_geometry(geometry_id):
         raise HTTPException(404, f"Geometry '{geometry_id}' not found")
@@ -124,7 +129,7 @@ async def delete_geometry(geometry_id: str):
 
 
 @router.post("/{geometry_id}/validate")
-async def validate_geometry_config(geometry_id: str):
+def validate_geometry_config(geometry_id: str):
     """Validate a saved geometry configuration."""
     geometry = geometry_builder.get_geometry(geometry_id)
     if not geometry:
@@ -134,13 +139,13 @@ async def validate_geometry_config(geometry_id: str):
 
 
 @router.post("/validate")
-async def validate_geometry(geometry: DetectorGeometry):
+def validate_geometry(geometry: DetectorGeometry):
     """Validate a geometry configuration without saving."""
     return geometry_builder.validate_geometry(geometry)
 
 
 @router.get("/{geometry_id}/gdml")
-async def export_gdml(geometry_id: str):
+def export_gdml(geometry_id: str):
     """
     Export geometry to GDML format.
     
@@ -150,16 +155,8 @@ async def export_gdml(geometry_id: str):
     if not geometry:
         raise HTTPException(404, f"Geometry '{geometry_id}' not found")
     
-    from pathlib import Path
-    import tempfile
-    
-    with tempfile.NamedTemporaryFile(suffix=".gdml", delete=False) as f:
-        gdml_path = Path(f.name)
-    
-    geometry_builder.to_gdml(geometry, gdml_path)
-    gdml_content = gdml_path.read_text()
-    gdml_path.unlink()
-    
+    gdml_content = geometry_builder.to_gdml_string(geometry)
+
     return Response(
         content=gdml_content,
         media_type="application/xml",
@@ -170,7 +167,7 @@ async def export_gdml(geometry_id: str):
 
 
 @router.post("/{geometry_id}/copy")
-async def copy_geometry(geometry_id: str, new_name: str):
+def copy_geometry(geometry_id: str, new_name: str):
     """Create a copy of a geometry with a new name."""
     geometry = geometry_builder.get_geometry(geometry_id)
     if not geometry:
@@ -4,6 +4,7 @@ Physics configuration API endpoints.
 
 from typing import List, Dict, Any
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import ORJSONResponse
 
 from app.models.physics import PhysicsConfig, PhysicsListType, EMPhysicsOption
 from app.core.physics_builder import (
@@ -15,31 +16,44 @@ router = APIRouter()
 
 
 @router.get("", response_model=List[str])
-@router.get("/", response_model=List[str], include_in_schema=False)
 async def list_physics_configs():
     """List all saved physics configurations."""
     return physics_builder.list_physics()
 
 
+# The template registry is static - build the listing payload once at import.
+_TEMPLATES_LIST_RESPONSE = {
+    name: {
+        "physics_list": config.physics_list.value,
+        "em_physics": config.em_physics.value,
+        "default_cut": config.default_cut
+    }
+    for name, config in PHYSICS_TEMPLATES.items()
+}
+
+
 @router.get("/templates", response_model=Dict[str, Any])
 async def list_templates():
     """List available physics templates."""
-    return {
-        name: {
-            "physics_list": config.physics_list.value,
-            "em_physics": config.em_physics.value,
-            "default_cut": config.default_cut
-        }
-        for name, config in PHYSICS_TEMPLATES.items()
-    }
+    return _TEMPLATES_LIST_RESPONSE
 
 
-@router.get("/templates/{template_name}", response_model=PhysicsConfig)
+@router.get("/templates/{template_name}")
 async def get_template(template_name: str):
     """Get a physics template configuration."""
     if template_name not in PHYSICS_TEMPLATES:
         raise HTTPException(404, f"Template '{template_name}' not found")
-    return PHYSICS_TEMPLATES[template_name]
+    # Templates are validated at import - skip response re-validation
+    return ORJSONResponse(PHYSICS_TEMPLATES[template_name].model_dump(mode="json"))
+
+
+# Physics list info is static - cache value lookups and info payloads at
+# import time instead of constructing ValueError on every bad request.
+_PL_BY_VALUE = {pl.value: pl for pl in PhysicsListType}
+_PL_INFO_CACHE = {
+    pl: physics_builder.get_physics_list_info(pl) for pl in PhysicsListType
+}
+_PL_LIST_RESPONSE = list(_PL_INFO_CACHE.values())
 
 
 @router.get("/physics-lists")
@@ -47,45 +61,45 @@ async def list_physics_lists():
     """
     List available Geant4 physics lists with descriptions.
     """
-    return [
-        physics_builder.get_physics_list_info(pl)
-        for pl in PhysicsListType
-    ]
+    return _PL_LIST_RESPONSE
 
 
 @router.get("/physics-lists/{list_name}")
 async def get_physics_list_info(list_name: str):
     """Get detailed information about a physics list."""
-    try:
-        pl_type = PhysicsListType(list_name)
-    except ValueError:
+    pl_type = _PL_BY_VALUE.get(list_name)
+    if pl_type is None:
         raise HTTPException(404, f"Physics list '{list_name}' not found")
-    
-    return physics_builder.get_physics_list_info(pl_type)
+
+    return _PL_INFO_CACHE[pl_type]
+
+
+# EM option descriptions are static - precompute the response once at import.
+_EM_OPTION_DESCRIPTIONS = {
+    EMPhysicsOption.STANDARD: "Standard EM physics, good for most applications",
+    EMPhysicsOption.OPTION1: "EM physics with improved multiple scattering",
+    EMPhysicsOption.OPTION2: "EM physics optimized for calorimetry",
+    EMPhysicsOption.OPTION3: "EM physics with Goudsmit-Saunderson MSC",
+    EMPhysicsOption.OPTION4: "EM physics optimized for medical applications",
+    EMPhysicsOption.LIVERMORE: "Low-energy EM based on Livermore data (down to 250 eV)",
+    EMPhysicsOption.PENELOPE: "Low-energy EM based on PENELOPE (down to 100 eV)",
+    EMPhysicsOption.DNA: "Geant4-DNA physics for microdosimetry"
+}
+
+_EM_OPTIONS_RESPONSE = [
+    {
+        "name": opt.name,
+        "value": opt.value,
+        "description": _EM_OPTION_DESCRIPTIONS.get(opt, "")
+    }
+    for opt in EMPhysicsOption
+]
 
 
 @router.get("/em-options")
 async def list_em_options():
     """List available EM physics options."""
-    descriptions = {
-        EMPhysicsOption.STANDARD: "Standard EM physics, good for most applications",
-        EMPhysicsOption.OPTION1: "EM physics with improved multiple scattering",
-        EMPhysicsOption.OPTION2: "EM physics optimized for calorimetry",
-        EMPhysicsOption.OPTION3: "EM physics with Goudsmit-Saunderson MSC",
-        EMPhysicsOption.OPTION4: "EM physics optimized for medical applications",
-        EMPhysicsOption.LIVERMORE: "Low-energy EM based on Livermore data (down to 250 eV)",
-        EMPhysicsOption.PENELOPE: "Low-energy EM based on PENELOPE (down to 100 eV)",
-        EMPhysicsOption.DNA: "Geant4-DNA physics for microdosimetry"
-    }
-    
-    return [
-        {
-            "name": opt.name,
-            "value": opt.value,
-            "description": descriptions.get(opt, "")
-        }
-        for opt in EMPhysicsOption
-    ]
+    return _EM_OPTIONS_RESPONSE
 
 
 @router.post("/recommend")
@@ -115,7 +129,6 @@ async def recommend_physics(
 
 
 @router.post("", response_model=Dict[str, str])
-@router.post("/", response_model=Dict[str, str], include_in_schema=False)
 async def create_physics_config(config: PhysicsConfig, name: str):
     """
     Create and save a new physics configuration.
@@ -138,13 +151,14 @@ async def create_physics_config(config: PhysicsConfig, name: str):
     }
 
 
-@router.get("/{physics_id}", response_model=PhysicsConfig)
+@router.get("/{physics_id}")
 async def get_physics_config(physics_id: str):
     """Get a saved physics configuration."""
     config = physics_builder.get_physics(physics_id)
     if not config:
         raise HTTPException(404, f"Physics config '{physics_id}' not found")
-    return config
+    # Stored configs were validated on insert - skip re-validation
+    return ORJSONResponse(config.model_dump(mode="json"))
 
 
 @router.delete("/{physics_id}")
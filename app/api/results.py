@@ -2,13 +2,22 @@
 Simulation results API endpoints.
 """
 
+import itertools
+import shutil
+import tempfile
+import numpy as np
 from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import Response, FileResponse
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import (
+    Response, FileResponse, StreamingResponse, ORJSONResponse
+)
 from pathlib import Path
 
+from pydantic import TypeAdapter
+
 from app.models.results import (
-    SimulationResults, AnalysisResult, HistogramData
+    SimulationResults, AnalysisResult, HistogramData,
+    HitData, DetectorSummary
 )
 from app.core.result_collector import result_collector
 from app.core.simulation_engine import simulation_engine
@@ -16,48 +25,57 @@ from app.core.simulation_engine import simulation_engine
 
 router = APIRouter()
 
+# Batch serializers: one pydantic-core call per list instead of a Python
+# model_dump() per element
+_HITS_ADAPTER = TypeAdapter(List[HitData])
+_DETECTORS_ADAPTER = TypeAdapter(List[DetectorSummary])
+
+
+def _results_etag(simulation_id: str, results: SimulationResults) -> str:
+    """ETag for completed (immutable) results."""
+    return f'W/"{simulation_id}-{results.completed_at.isoformat()}"'
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    """Check whether the client already has this results version."""
+    return request.headers.get("if-none-match") == etag
+
 
 @router.get("", response_model=List[str])
-@router.get("/", response_model=List[str], include_in_schema=False)
-async def list_results():
+def list_results():
     """List all simulations with saved results."""
     return result_collector.list_simulations()
 
 
-@router.get("/{simulation_id}", response_model=SimulationResults)
-async def get_results(simulation_id: str):
+# Hits-heavy endpoints serialize large nested payloads; orjson encodes them
+# in C instead of json.dumps in pure Python.
+@router.get(
+    "/{simulation_id}",
+    response_model=SimulationResults,
+    response_class=ORJSONResponse
+)
+async def get_results(simulation_id: str, request: Request, response: Response):
     """
     Get complete results for a simulation.
     """
-    # Check if simulation exists
-    job = simulation_engine.get_simulation_status(simulation_id)
-    
-    # Try to get from engine first (for completed simulations)
-    if job:
-        results = await simulation_engine.get_results(simulation_id)
-        if results:
-            return results
-    
-    # Try to load from file
-    results = result_collector.load_results(simulation_id)
+    results = await simulation_engine.get_or_load_results(simulation_id)
     if not results:
         raise HTTPException(404, f"Results for simulation '{simulation_id}' not found")
-    
+
+    etag = _results_etag(simulation_id, results)
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
     return results
 
 
 @router.get("/{simulation_id}/summary")
-async def get_results_summary(simulation_id: str):
+async def get_results_summary(simulation_id: str, request: Request, response: Response):
     """
     Get summary statistics for a simulation.
     """
-    # Try to load from file first
-    results = result_collector.load_results(simulation_id)
-    
-    # If not found, try to get from simulation engine
-    if not results:
-        results = await simulation_engine.get_results(simulation_id)
-    
+    results = await simulation_engine.get_or_load_results(simulation_id)
+
     if not results:
         # Check if simulation exists but not completed
         job = simulation_engine.get_simulation_status(simulation_id)
@@ -70,7 +88,11 @@ async def get_results_summary(simulation_id: str):
                 "events_total": job.events_total
             }
         raise HTTPException(404, f"Results for simulation '{simulation_id}' not found")
-    
+
+    etag = _results_etag(simulation_id, results)
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
     return {
         "simulation_id": simulation_id,
         "simulation_name": results.simulation_name,
@@ -92,20 +114,24 @@ async def get_results_summary(simulation_id: str):
 
 
 @router.get("/{simulation_id}/detectors")
-async def get_detector_results(simulation_id: str):
+def get_detector_results(simulation_id: str, request: Request, response: Response):
     """Get per-detector results."""
     results = result_collector.load_results(simulation_id)
     if not results:
         raise HTTPException(404, f"Results for simulation '{simulation_id}' not found")
-    
+
+    etag = _results_etag(simulation_id, results)
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
     return {
         "simulation_id": simulation_id,
-        "detectors": [d.model_dump() for d in results.detector_summaries]
+        "detectors": _DETECTORS_ADAPTER.dump_python(results.detector_summaries)
     }
 
 
-@router.get("/{simulation_id}/hits")
-async def get_hits(
+@router.get("/{simulation_id}/hits", response_class=ORJSONResponse)
+def get_hits(
     simulation_id: str,
     detector: Optional[str] = None,
     particle: Optional[str] = None,
@@ -126,29 +152,42 @@ async def get_hits(
     
     if not results.hits:
         return {"simulation_id": simulation_id, "hits": [], "total": 0}
-    
-    hits = results.hits
-    
-    # Apply filters
-    if detector:
-        hits = [h for h in hits if h.detector_name == detector]
-    if particle:
-        hits = [h for h in hits if h.particle_name == particle]
-    
-    total = len(hits)
-    hits = hits[offset:offset + limit]
-    
+
+    # Filtered queries go through inverted indexes built once per loaded
+    # results object; unfiltered ones just slice the requested page
+    if detector or particle:
+        by_detector, by_particle = result_collector.hit_indexes(simulation_id, results)
+        if detector and particle:
+            particle_idx = set(by_particle.get(particle, ()))
+            idxs = [i for i in by_detector.get(detector, ()) if i in particle_idx]
+        elif detector:
+            idxs = by_detector.get(detector, [])
+        else:
+            idxs = by_particle.get(particle, [])
+        total = len(idxs)
+        page = [
+            results.hits[i]
+            for i in itertools.islice(idxs, offset, offset + limit)
+        ]
+    else:
+        total = len(results.hits)
+        page = list(itertools.islice(results.hits, offset, offset + limit))
+
     return {
         "simulation_id": simulation_id,
-        "hits": [h.model_dump() for h in hits],
+        "hits": _HITS_ADAPTER.dump_python(page),
         "total": total,
         "offset": offset,
         "limit": limit
     }
 
 
-@router.get("/{simulation_id}/analysis", response_model=AnalysisResult)
-async def get_analysis(
+@router.get(
+    "/{simulation_id}/analysis",
+    response_model=AnalysisResult,
+    response_class=ORJSONResponse
+)
+def get_analysis(
     simulation_id: str,
     analysis_type: str = "standard"
 ):
@@ -163,7 +202,7 @@ async def get_analysis(
 
 
 @router.get("/{simulation_id}/histogram/{hist_name}")
-async def get_histogram(
+def get_histogram(
     simulation_id: str,
     hist_name: str,
     bins: int = 100
@@ -171,50 +210,64 @@ async def get_histogram(
     """
     Get a specific histogram from results.
     """
-    results = result_collector.load_results(simulation_id)
-    if not results:
-        raise HTTPException(404, f"Results for simulation '{simulation_id}' not found")
-    
-    # Generate histogram based on name
-    if hist_name == "energy_deposit" and results.hits:
-        data = [h.energy_deposit for h in results.hits]
-        hist = result_collector.create_histogram(
-            data,
-            name="energy_deposit",
-            title="Energy Deposit Distribution",
-            x_label="Energy (MeV)",
-            bins=bins
-        )
-        return hist.model_dump()
-    
-    elif hist_name == "position_z" and results.hits:
-        data = [h.position_z for h in results.hits]
-        hist = result_collector.create_histogram(
-            data,
-            name="position_z",
-            title="Hit Position Z Distribution",
-            x_label="Z Position (mm)",
-            bins=bins
-        )
-        return hist.model_dump()
-    
-    else:
+    titles = {
+        "energy_deposit": ("Energy Deposit Distribution", "Energy (MeV)"),
+        "position_z": ("Hit Position Z Distribution", "Z Position (mm)")
+    }
+    if hist_name not in titles:
         raise HTTPException(
-            404, 
+            404,
             f"Histogram '{hist_name}' not available. "
             "Available: energy_deposit, position_z"
         )
 
+    # Prefer the persisted column: a mmapped .npy read skips JSON parsing
+    data = result_collector.load_hit_column(simulation_id, hist_name)
+    if data is None:
+        results = result_collector.load_results(simulation_id)
+        if not results:
+            raise HTTPException(404, f"Results for simulation '{simulation_id}' not found")
+        if not results.hits:
+            raise HTTPException(404, f"No hits data for simulation '{simulation_id}'")
+        data = np.fromiter(
+            (getattr(h, hist_name) for h in results.hits),
+            dtype=np.float64,
+            count=len(results.hits)
+        )
+
+    title, x_label = titles[hist_name]
+    hist = result_collector.create_histogram(
+        data,
+        name=hist_name,
+        title=title,
+        x_label=x_label,
+        bins=bins
+    )
+    return hist.model_dump()
+
 
 @router.get("/{simulation_id}/export/json")
-async def export_json(simulation_id: str):
+def export_json(simulation_id: str):
     """Export results as JSON file."""
     results = result_collector.load_results(simulation_id)
     if not results:
         raise HTTPException(404, f"Results for simulation '{simulation_id}' not found")
-    
-    return Response(
-        content=results.model_dump_json(indent=2),
+
+    def json_chunks():
+        # Serialize the summary without hits, then splice the hits array in
+        # piece by piece so large exports never exist as a single string.
+        head = results.model_dump_json(exclude={"hits"})
+        if not results.hits:
+            yield head
+            return
+
+        yield head[:-1] + ',"hits":['
+        for i, hit in enumerate(results.hits):
+            yield hit.model_dump_json() if i == 0 else "," + hit.model_dump_json()
+        yield "]}"
+
+    return StreamingResponse(
+        json_chunks(),
         media_type="application/json",
         headers={
             "Content-Disposition": f"attachment; filename={simulation_id}_results.json"
@@ -223,10 +276,8 @@ async def export_json(simulation_id: str):
 
 
 @router.get("/{simulation_id}/export/csv")
-async def export_csv(simulation_id: str):
+def export_csv(simulation_id: str):
     """Export hits as CSV file."""
-    import tempfile
-    
     results = result_collector.load_results(simulation_id)
     if not results:
         raise HTTPException(404, f"Results for simulation '{simulation_id}' not found")
@@ -243,7 +294,7 @@ async def export_csv(simulation_id: str):
         csv_path = Path(f.name)
     
     result_collector.export_csv(simulation_id, csv_path)
-    
+
     return FileResponse(
         csv_path,
         media_type="text/csv",
@@ -251,22 +302,53 @@ async def export_csv(simulation_id: str):
     )
 
 
+@router.get("/{simulation_id}/export/parquet")
+def export_parquet(simulation_id: str):
+    """Export hits as a Parquet file."""
+    results = result_collector.load_results(simulation_id)
+    if not results:
+        raise HTTPException(404, f"Results for simulation '{simulation_id}' not found")
+
+    if not results.hits:
+        raise HTTPException(400, "No hits data available for export")
+
+    # Create temp file
+    with tempfile.NamedTemporaryFile(
+        mode='w',
+        suffix='.parquet',
+        delete=False
+    ) as f:
+        parquet_path = Path(f.name)
+
+    try:
+        result_collector.export_parquet(simulation_id, parquet_path)
+    except ImportError:
+        raise HTTPException(
+            501, "Parquet export requires a parquet engine (pyarrow)"
+        )
+
+    return FileResponse(
+        parquet_path,
+        media_type="application/vnd.apache.parquet",
+        filename=f"{simulation_id}_hits.parquet"
+    )
+
+
 @router.delete("/{simulation_id}")
-async def delete_results(simulation_id: str):
+def delete_results(simulation_id: str):
     """Delete simulation results."""
     results_path = result_collector.results_path / simulation_id
     
     if not results_path.exists():
         raise HTTPException(404, f"Results for simulation '{simulation_id}' not found")
-    
-    import shutil
+
     shutil.rmtree(results_path)
     
     return {"message": f"Results for simulation '{simulation_id}' deleted"}
 
 
 @router.get("/{simulation_id}/live")
-async def get_live_stats(simulation_id: str):
+def get_live_stats(simulation_id: str):
     """
     Get live statistics for a running simulation.
     
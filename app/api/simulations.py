@@ -2,8 +2,11 @@
 Simulation management API endpoints.
 """
 
+import asyncio
+from datetime import datetime
+from time import monotonic
 from typing import List, Optional
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException
 from loguru import logger
 
 from app.models.simulation import (
@@ -14,6 +17,7 @@ from app.models.geometry import DetectorGeometry
 from app.models.physics import PhysicsConfig
 from app.models.particle import ParticleSource
 from app.core.simulation_engine import simulation_engine
+from app.core.event_manager import event_manager
 from app.core.geometry_builder import geometry_builder, GEOMETRY_TEMPLATES
 from app.core.physics_builder import physics_builder, PHYSICS_TEMPLATES
 from app.core.source_builder import source_builder, SOURCE_TEMPLATES
@@ -21,27 +25,53 @@ from app.core.source_builder import source_builder, SOURCE_TEMPLATES
 
 router = APIRouter()
 
+# Resolution table for create_simulation: inline payloads validate
+# through pydantic-core, id references hit the matching builder store
+# Strong references to running simulation tasks; create_task results are
+# garbage-collected otherwise
+_running: set = set()
+
+
+async def _drain_simulation(simulation_id: str):
+    """Run a simulation, forwarding its events to WebSocket subscribers."""
+    async for event in simulation_engine.start_simulation(simulation_id):
+        await event_manager.publish(
+            event.simulation_id, event.event_type, event.data
+        )
+
+
+# Prevalidated quick-start configs; requests only patch the event counts
+# via model_copy instead of paying a full validation pass
+_QUICK_PROTOTYPES = {
+    name: SimulationConfig(
+        name=f"{name}_quick",
+        description=f"Quick-start simulation using {name} template",
+        num_events=1,
+        output_every_n_events=1
+    )
+    for name in GEOMETRY_TEMPLATES
+}
+
+_CONFIG_RESOLVERS = (
+    ("geometry", "geometry_id", DetectorGeometry, geometry_builder.get_geometry, "Geometry"),
+    ("physics", "physics_id", PhysicsConfig, physics_builder.get_physics, "Physics config"),
+    ("source", "source_id", ParticleSource, source_builder.get_source, "Source"),
+)
+
 
 @router.get("", response_model=List[SimulationJob])
-@router.get("/", response_model=List[SimulationJob], include_in_schema=False)
 async def list_simulations(
     status: Optional[SimulationStatus] = None
 ):
     """
     List all simulations.
-    
+
     Optionally filter by status.
     """
-    jobs = simulation_engine.list_simulations()
-    
-    if status:
-        jobs = [j for j in jobs if j.status == status]
-    
-    return jobs
+    return simulation_engine.list_simulations(status)
 
 
 @router.post("", response_model=SimulationJob)
-@router.post("/", response_model=SimulationJob, include_in_schema=False)
 async def create_simulation(request: SimulationRequest):
     """
     Create a new simulation.
@@ -50,49 +80,35 @@ async def create_simulation(request: SimulationRequest):
     - Reference saved configurations by ID (geometry_id, physics_id, source_id)
     - Provide inline configurations (geometry, physics, source)
     """
-    # Resolve geometry
-    geometry = None
-    if request.geometry:
-        geometry = DetectorGeometry(**request.geometry) if isinstance(request.geometry, dict) else request.geometry
-    elif request.geometry_id:
-        geometry = geometry_builder.get_geometry(request.geometry_id)
-        if not geometry:
-            raise HTTPException(404, f"Geometry '{request.geometry_id}' not found")
-    
-    # Resolve physics
-    physics = None
-    if request.physics:
-        physics = PhysicsConfig(**request.physics) if isinstance(request.physics, dict) else request.physics
-    elif request.physics_id:
-        physics = physics_builder.get_physics(request.physics_id)
-        if not physics:
-            raise HTTPException(404, f"Physics config '{request.physics_id}' not found")
-    
-    # Resolve source
-    source = None
-    if request.source:
-        source = ParticleSource(**request.source) if isinstance(request.source, dict) else request.source
-    elif request.source_id:
-        source = source_builder.get_source(request.source_id)
-        if not source:
-            raise HTTPException(404, f"Source '{request.source_id}' not found")
-    
+    resolved = {}
+    for field, id_field, model, get_saved, label in _CONFIG_RESOLVERS:
+        inline = getattr(request, field)
+        if inline is not None:
+            resolved[field] = (
+                model.model_validate(inline) if isinstance(inline, dict) else inline
+            )
+            continue
+
+        ref = getattr(request, id_field)
+        if ref:
+            config = get_saved(ref)
+            if not config:
+                raise HTTPException(404, f"{label} '{ref}' not found")
+            resolved[field] = config
+        else:
+            resolved[field] = None
+
     # Create simulation job
     job = await simulation_engine.create_simulation(
         config=request.simulation,
-        geometry=geometry,
-        physics=physics,
-        source=source
+        **resolved
     )
-    
+
     return job
 
 
 @router.post("/{simulation_id}/start")
-async def start_simulation(
-    simulation_id: str,
-    background_tasks: BackgroundTasks
-):
+async def start_simulation(simulation_id: str):
     """
     Start a simulation.
     
@@ -109,14 +125,13 @@ async def start_simulation(
             f"Cannot start simulation in status '{job.status}'"
         )
     
-    # Start simulation in background
-    async def run_simulation():
-        async for event in simulation_engine.start_simulation(simulation_id):
-            # Events are handled by WebSocket subscribers
-            pass
-    
-    background_tasks.add_task(run_simulation)
-    
+    # Start immediately instead of queueing behind BackgroundTasks,
+    # which only runs after the response and serializes task execution
+    task = asyncio.create_task(_drain_simulation(simulation_id))
+    _running.add(task)
+    task.add_done_callback(_running.discard)
+
+
     return {
         "message": f"Simulation {simulation_id} started",
         "status": "starting",
@@ -167,9 +182,11 @@ async def get_simulation_progress(simulation_id: str):
     if not job:
         raise HTTPException(404, f"Simulation '{simulation_id}' not found")
     
+    # Monotonic subtraction beats datetime arithmetic on this hot poll
     elapsed = 0.0
-    if job.started_at:
-        from datetime import datetime
+    if job.started_monotonic is not None:
+        elapsed = monotonic() - job.started_monotonic
+    elif job.started_at:
         elapsed = (datetime.utcnow() - job.started_at).total_seconds()
     
     progress_pct = (job.events_completed / job.events_total * 100) if job.events_total > 0 else 0
@@ -191,18 +208,16 @@ async def get_simulation_progress(simulation_id: str):
 @router.delete("/{simulation_id}")
 async def delete_simulation(simulation_id: str):
     """Delete a simulation and its results."""
-    job = simulation_engine.get_simulation_status(simulation_id)
+    job = simulation_engine.pop_simulation(simulation_id)
     if not job:
         raise HTTPException(404, f"Simulation '{simulation_id}' not found")
-    
-    # Cancel if running
+
+    # Kill the subprocess if the job was still running
     if job.status == SimulationStatus.RUNNING:
-        await simulation_engine.cancel_simulation(simulation_id)
-    
-    # Remove from active simulations
-    if simulation_id in simulation_engine.active_simulations:
-        del simulation_engine.active_simulations[simulation_id]
-    
+        process = simulation_engine.simulation_processes.pop(simulation_id, None)
+        if process:
+            process.terminate()
+
     return {"message": f"Simulation {simulation_id} deleted"}
 
 
@@ -210,8 +225,7 @@ async def delete_simulation(simulation_id: str):
 @router.post("/quick-start/{template_name}")
 async def quick_start_simulation(
     template_name: str,
-    num_events: int = 1000,
-    background_tasks: BackgroundTasks = None
+    num_events: int = 1000
 ):
     """
     Quick-start a simulation using predefined templates.
@@ -225,21 +239,19 @@ async def quick_start_simulation(
     geometry = GEOMETRY_TEMPLATES.get(template_name)
     physics = PHYSICS_TEMPLATES.get("standard")
     source = SOURCE_TEMPLATES.get("gamma_1mev")
-    
+
     if not geometry:
         available = list(GEOMETRY_TEMPLATES.keys())
         raise HTTPException(
-            404, 
+            404,
             f"Template '{template_name}' not found. Available: {available}"
         )
-    
-    # Create config
-    config = SimulationConfig(
-        name=f"{template_name}_quick",
-        description=f"Quick-start simulation using {template_name} template",
-        num_events=num_events,
-        output_every_n_events=max(1, num_events // 10)
-    )
+
+    # Patch the prevalidated prototype instead of building a new config
+    config = _QUICK_PROTOTYPES[template_name].model_copy(update={
+        "num_events": num_events,
+        "output_every_n_events": max(1, num_events // 10)
+    })
     
     # Create and start
     job = await simulation_engine.create_simulation(
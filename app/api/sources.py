@@ -2,8 +2,10 @@
 Particle source configuration API endpoints.
 """
 
+import orjson
 from typing import List, Dict, Any
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import Response
 
 from app.models.particle import (
     ParticleSource, ParticleType, EnergyDistribution,
@@ -18,24 +20,92 @@ router = APIRouter()
 
 
 @router.get("", response_model=List[str])
-@router.get("/", response_model=List[str], include_in_schema=False)
 async def list_sources():
     """List all saved particle source configurations."""
     return source_builder.list_sources()
 
 
+# These listings are pure functions of module state - build the response
+# payloads once at import time instead of per request.
+_TEMPLATES_LIST_RESPONSE = {
+    name: {
+        "particle": source.particle,
+        "energy": source.energy.value,
+        "energy_unit": "MeV",
+        "distribution": source.energy.distribution.value
+    }
+    for name, source in SOURCE_TEMPLATES.items()
+}
+
+_ENERGY_DIST_DESCRIPTIONS = {
+    EnergyDistribution.MONO: "Monoenergetic - single energy value",
+    EnergyDistribution.GAUSSIAN: "Gaussian distribution around mean energy",
+    EnergyDistribution.FLAT: "Flat/uniform distribution between min and max",
+    EnergyDistribution.EXPONENTIAL: "Exponential decay spectrum",
+    EnergyDistribution.POWER_LAW: "Power law spectrum",
+    EnergyDistribution.USER_DEFINED: "User-defined spectrum from file"
+}
+
+_ANGULAR_DIST_DESCRIPTIONS = {
+    AngularDistribution.ISOTROPIC: "Uniform in all directions (4π)",
+    AngularDistribution.DIRECTED: "Single direction (pencil beam)",
+    AngularDistribution.COSINE: "Cosine-law distribution",
+    AngularDistribution.CONE: "Cone around a direction",
+    AngularDistribution.USER_DEFINED: "User-defined angular distribution"
+}
+
+# Lookup by Geant4 name ("e-") or enum name ("electron") without
+# scanning the enum per request
+_PARTICLE_BY_KEY = {}
+for _p in ParticleType:
+    _PARTICLE_BY_KEY[_p.value] = _p
+    _PARTICLE_BY_KEY[_p.name.lower()] = _p
+
+_POSITION_DIST_DESCRIPTIONS = {
+    PositionDistribution.POINT: "Point source at a single location",
+    PositionDistribution.PLANE: "Distributed on a plane (rectangle)",
+    PositionDistribution.SURFACE: "Distributed on a surface (sphere, etc.)",
+    PositionDistribution.VOLUME: "Distributed within a volume"
+}
+
+
+def _distribution_response(enum_type, descriptions) -> List[Dict[str, str]]:
+    return [
+        {
+            "name": d.name,
+            "value": d.value,
+            "description": descriptions.get(d, "")
+        }
+        for d in enum_type
+    ]
+
+
+_ENERGY_DIST_RESPONSE = _distribution_response(
+    EnergyDistribution, _ENERGY_DIST_DESCRIPTIONS
+)
+_ANGULAR_DIST_RESPONSE = _distribution_response(
+    AngularDistribution, _ANGULAR_DIST_DESCRIPTIONS
+)
+_POSITION_DIST_RESPONSE = _distribution_response(
+    PositionDistribution, _POSITION_DIST_DESCRIPTIONS
+)
+
+# Particle reference data is static, so the /particles payload is
+# serialized once and served as raw bytes
+_PARTICLES_BYTES = orjson.dumps([
+    {
+        "name": p.name,
+        "value": p.value,
+        "info": source_builder.get_particle_info(p.value)
+    }
+    for p in ParticleType
+])
+
+
 @router.get("/templates", response_model=Dict[str, Any])
 async def list_templates():
     """List available source templates."""
-    return {
-        name: {
-            "particle": source.particle,
-            "energy": source.energy.value,
-            "energy_unit": "MeV",
-            "distribution": source.energy.distribution.value
-        }
-        for name, source in SOURCE_TEMPLATES.items()
-    }
+    return _TEMPLATES_LIST_RESPONSE
 
 
 @router.get("/templates/{template_name}", response_model=ParticleSource)
@@ -49,95 +119,40 @@ async def get_template(template_name: str):
 @router.get("/particles")
 async def list_particles():
     """List available particle types with properties."""
-    return [
-        {
-            "name": p.name,
-            "value": p.value,
-            "info": source_builder.get_particle_info(p.value)
-        }
-        for p in ParticleType
-    ]
+    return Response(content=_PARTICLES_BYTES, media_type="application/json")
 
 
 @router.get("/particles/{particle_name}")
 async def get_particle_info(particle_name: str):
     """Get detailed information about a particle type."""
-    info = source_builder.get_particle_info(particle_name)
-    if not info.get("pdg"):
-        # Try to find in enum
-        for p in ParticleType:
-            if p.value == particle_name or p.name.lower() == particle_name.lower():
-                info = source_builder.get_particle_info(p.value)
-                break
-    
-    return info
+    particle = (
+        _PARTICLE_BY_KEY.get(particle_name)
+        or _PARTICLE_BY_KEY.get(particle_name.lower())
+    )
+    return source_builder.get_particle_info(
+        particle.value if particle else particle_name
+    )
 
 
 @router.get("/energy-distributions")
 async def list_energy_distributions():
     """List available energy distribution types."""
-    descriptions = {
-        EnergyDistribution.MONO: "Monoenergetic - single energy value",
-        EnergyDistribution.GAUSSIAN: "Gaussian distribution around mean energy",
-        EnergyDistribution.FLAT: "Flat/uniform distribution between min and max",
-        EnergyDistribution.EXPONENTIAL: "Exponential decay spectrum",
-        EnergyDistribution.POWER_LAW: "Power law spectrum",
-        EnergyDistribution.USER_DEFINED: "User-defined spectrum from file"
-    }
-    
-    return [
-        {
-            "name": d.name,
-            "value": d.value,
-            "description": descriptions.get(d, "")
-        }
-        for d in EnergyDistribution
-    ]
+    return _ENERGY_DIST_RESPONSE
 
 
 @router.get("/angular-distributions")
 async def list_angular_distributions():
     """List available angular distribution types."""
-    descriptions = {
-        AngularDistribution.ISOTROPIC: "Uniform in all directions (4π)",
-        AngularDistribution.DIRECTED: "Single direction (pencil beam)",
-        AngularDistribution.COSINE: "Cosine-law distribution",
-        AngularDistribution.CONE: "Cone around a direction",
-        AngularDistribution.USER_DEFINED: "User-defined angular distribution"
-    }
-    
-    return [
-        {
-            "name": d.name,
-            "value": d.value,
-            "description": descriptions.get(d, "")
-        }
-        for d in AngularDistribution
-    ]
+    return _ANGULAR_DIST_RESPONSE
 
 
 @router.get("/position-distributions")
 async def list_position_distributions():
     """List available position distribution types."""
-    descriptions = {
-        PositionDistribution.POINT: "Point source at a single location",
-        PositionDistribution.PLANE: "Distributed on a plane (rectangle)",
-        PositionDistribution.SURFACE: "Distributed on a surface (sphere, etc.)",
-        PositionDistribution.VOLUME: "Distributed within a volume"
-    }
-    
-    return [
-        {
-            "name": d.name,
-            "value": d.value,
-            "description": descriptions.get(d, "")
-        }
-        for d in PositionDistribution
-    ]
+    return _POSITION_DIST_RESPONSE
 
 
 @router.post("", response_model=Dict[str, str])
-@router.post("/", response_model=Dict[str, str], include_in_schema=False)
 async def create_source(source: ParticleSource):
     """
     Create and save a new particle source configuration.
@@ -3,7 +3,8 @@ WebSocket endpoints for real-time simulation streaming.
 """
 
 import asyncio
-import json
+import numpy as np
+import orjson
 from typing import Optional
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
 from loguru import logger
@@ -20,49 +21,154 @@ class ConnectionManager:
     """Manages WebSocket connections."""
     
     def __init__(self):
-        self.active_connections: dict[str, list[WebSocket]] = {}
-    
+        self.active_connections: dict[str, set[WebSocket]] = {}
+        # Clients on the all-simulations feed, kept for broadcast_all
+        self.all_feed: set[WebSocket] = set()
+
     async def connect(self, websocket: WebSocket, simulation_id: str):
         await websocket.accept()
-        if simulation_id not in self.active_connections:
-            self.active_connections[simulation_id] = []
-        self.active_connections[simulation_id].append(websocket)
-        logger.info(f"WebSocket connected for simulation {simulation_id}")
-    
+        self.active_connections.setdefault(simulation_id, set()).add(websocket)
+        logger.info("WebSocket connected for simulation {}", simulation_id)
+
     def disconnect(self, websocket: WebSocket, simulation_id: str):
-        if simulation_id in self.active_connections:
-            try:
-                self.active_connections[simulation_id].remove(websocket)
-                if not self.active_connections[simulation_id]:
-                    del self.active_connections[simulation_id]
-            except ValueError:
-                pass
-        logger.info(f"WebSocket disconnected from simulation {simulation_id}")
-    
+        connections = self.active_connections.get(simulation_id)
+        if connections is not None:
+            connections.discard(websocket)
+            if not connections:
+                self.active_connections.pop(simulation_id, None)
+        logger.info("WebSocket disconnected from simulation {}", simulation_id)
+
     async def broadcast(self, simulation_id: str, message: dict):
         """Broadcast message to all connected clients for a simulation."""
-        if simulation_id in self.active_connections:
-            disconnected = []
-            for connection in self.active_connections[simulation_id]:
-                try:
-                    await connection.send_json(message)
-                except Exception:
-                    disconnected.append(connection)
-            
-            # Clean up disconnected
-            for conn in disconnected:
-                self.disconnect(conn, simulation_id)
-    
+        connections = self.active_connections.get(simulation_id)
+        if not connections:
+            return
+
+        # Encode once for the whole room instead of per subscriber
+        payload = orjson.dumps(message, option=orjson.OPT_SERIALIZE_NUMPY)
+        targets = list(connections)
+        results = await asyncio.gather(
+            *(connection.send_bytes(payload) for connection in targets),
+            return_exceptions=True
+        )
+
+        # Clean up disconnected
+        for connection, result in zip(targets, results):
+            if isinstance(result, Exception):
+                self.disconnect(connection, simulation_id)
+
+    async def broadcast_all(self, message: dict):
+        """Send a message to every connected client, on any feed."""
+        targets = [
+            connection
+            for connections in self.active_connections.values()
+            for connection in connections
+        ]
+        targets.extend(self.all_feed)
+        if not targets:
+            return
+
+        payload = orjson.dumps(message, option=orjson.OPT_SERIALIZE_NUMPY)
+        await asyncio.gather(
+            *(connection.send_bytes(payload) for connection in targets),
+            return_exceptions=True
+        )
+
     async def send_personal(self, websocket: WebSocket, message: dict):
         """Send message to a specific client."""
         try:
-            await websocket.send_json(message)
+            await websocket.send_bytes(
+                orjson.dumps(message, option=orjson.OPT_SERIALIZE_NUMPY)
+            )
         except Exception as e:
-            logger.error(f"Error sending WebSocket message: {e}")
+            logger.error("Error sending WebSocket message: {}", e)
 
 
 manager = ConnectionManager()
 
+# Cap merged event_batch payloads so slow clients get bounded messages
+_MAX_SAMPLE_HITS = 64
+
+_HEARTBEAT_INTERVAL = 30.0
+
+
+async def heartbeat_loop():
+    """
+    Tick heartbeats to every client from one shared timer.
+
+    Started once at app startup; replaces the per-connection
+    wait_for(queue.get(), timeout=30) timers the send loops used to arm
+    for every event.
+    """
+    while True:
+        await asyncio.sleep(_HEARTBEAT_INTERVAL)
+        await manager.broadcast_all({"event_type": "heartbeat"})
+
+
+# Client commands that map straight onto engine calls
+_COMMANDS = {
+    "pause": simulation_engine.pause_simulation,
+    "resume": simulation_engine.resume_simulation,
+    "cancel": simulation_engine.cancel_simulation,
+}
+
+
+def _coalesce_events(events: list) -> list:
+    """
+    Collapse a drained backlog into at most one progress, one status and
+    one merged event_batch; other event types keep their order.
+    """
+    if len(events) == 1:
+        return events
+
+    progress = None
+    status = None
+    batches = []
+    outgoing = []
+
+    for event in events:
+        event_type = event.get("event_type")
+        if event_type == "progress":
+            progress = event
+        elif event_type == "status":
+            status = event
+        elif event_type == "event_batch":
+            batches.append(event)
+        else:
+            outgoing.append(event)
+
+    merged = []
+    if status:
+        merged.append(status)
+    if progress:
+        merged.append(progress)
+    if batches:
+        if len(batches) == 1:
+            merged.append(batches[0])
+        else:
+            pieces = [
+                p for p in (
+                    batch.get("data", {}).get("sample_hits")
+                    for batch in batches
+                )
+                if p is not None and len(p)
+            ]
+            data = {
+                **batches[-1].get("data", {}),
+                "batch_start": batches[0].get("data", {}).get("batch_start")
+            }
+            # Hits may already be stripped upstream for this subscriber;
+            # numpy blocks concatenate, per-hit dict lists chain
+            if pieces:
+                if isinstance(pieces[0], np.ndarray):
+                    data["sample_hits"] = np.concatenate(pieces)[-_MAX_SAMPLE_HITS:]
+                else:
+                    hits = [hit for piece in pieces for hit in piece]
+                    data["sample_hits"] = hits[-_MAX_SAMPLE_HITS:]
+            merged.append({**batches[-1], "data": data})
+
+    return merged + outgoing
+
 
 @router.websocket("/simulations/{simulation_id}")
 async def simulation_websocket(
@@ -114,8 +220,10 @@ async def simulation_websocket(
             }
         })
         
-        # Subscribe to events
-        queue = await event_manager.subscribe(simulation_id)
+        # Subscribe to events; hit filtering happens at publish time
+        queue = event_manager.subscribe(
+            simulation_id, include_hits=include_hits
+        )
         
         try:
             # Listen for client messages and events
@@ -126,23 +234,12 @@ async def simulation_websocket(
                         
                         # Handle client commands
                         command = data.get("command")
-                        if command == "pause":
-                            await simulation_engine.pause_simulation(simulation_id)
-                            await manager.send_personal(websocket, {
-                                "event_type": "command_response",
-                                "data": {"command": "pause", "success": True}
-                            })
-                        elif command == "resume":
-                            await simulation_engine.resume_simulation(simulation_id)
+                        handler = _COMMANDS.get(command)
+                        if handler:
+                            success = await handler(simulation_id)
                             await manager.send_personal(websocket, {
                                 "event_type": "command_response",
-                                "data": {"command": "resume", "success": True}
-                            })
-                        elif command == "cancel":
-                            await simulation_engine.cancel_simulation(simulation_id)
-                            await manager.send_personal(websocket, {
-                                "event_type": "command_response",
-                                "data": {"command": "cancel", "success": True}
+                                "data": {"command": command, "success": success}
                             })
                         elif command == "get_status":
                             job = simulation_engine.get_simulation_status(simulation_id)
@@ -158,58 +255,54 @@ async def simulation_websocket(
                     except WebSocketDisconnect:
                         break
                     except Exception as e:
-                        logger.error(f"Error receiving WebSocket message: {e}")
+                        logger.error("Error receiving WebSocket message: {}", e)
             
             async def send_events():
                 while True:
+                    # The event manager delivers lists of events batched
+                    # per flush window
+                    events = list(await queue.get())
+
                     try:
-                        # Wait for event with timeout
-                        event = await asyncio.wait_for(queue.get(), timeout=30.0)
-                        
-                        # Filter based on client preferences
-                        if not include_hits and event.get("event_type") == "event_batch":
-                            # Send without hit data
-                            filtered_event = {**event}
-                            if "data" in filtered_event and "sample_hits" in filtered_event["data"]:
-                                del filtered_event["data"]["sample_hits"]
-                            await manager.send_personal(websocket, filtered_event)
-                        else:
+                        # Drain whatever else queued up while we were
+                        # sending, so a fast producer never backs up
+                        # behind a slow client
+                        while True:
+                            try:
+                                events.extend(queue.get_nowait())
+                            except asyncio.QueueEmpty:
+                                break
+
+                        finished = False
+                        for event in _coalesce_events(events):
                             await manager.send_personal(websocket, event)
-                        
-                        # Check if simulation completed
-                        if event.get("event_type") in ["completed", "error", "cancelled"]:
+
+                            # Check if simulation completed
+                            if event.get("event_type") in ["completed", "error", "cancelled"]:
+                                finished = True
+
+                        if finished:
                             break
-                            
-                    except asyncio.TimeoutError:
-                        # Send heartbeat
-                        await manager.send_personal(websocket, {
-                            "event_type": "heartbeat",
-                            "simulation_id": simulation_id
-                        })
                     except Exception as e:
-                        logger.error(f"Error sending event: {e}")
+                        logger.error("Error sending event: {}", e)
                         break
             
-            # Run both tasks concurrently
-            receive_task = asyncio.create_task(receive_messages())
-            send_task = asyncio.create_task(send_events())
-            
-            done, pending = await asyncio.wait(
-                [receive_task, send_task],
-                return_when=asyncio.FIRST_COMPLETED
-            )
-            
-            # Cancel pending tasks
-            for task in pending:
-                task.cancel()
-                
+            # Run both loops concurrently; whichever finishes first
+            # cancels its sibling, and the TaskGroup guarantees both are
+            # reaped before we fall through to unsubscribe
+            async with asyncio.TaskGroup() as tg:
+                receive_task = tg.create_task(receive_messages())
+                send_task = tg.create_task(send_events())
+                receive_task.add_done_callback(lambda _: send_task.cancel())
+                send_task.add_done_callback(lambda _: receive_task.cancel())
+
         finally:
-            await event_manager.unsubscribe(simulation_id, queue)
+            event_manager.unsubscribe(simulation_id, queue)
             
     except WebSocketDisconnect:
-        logger.info(f"Client disconnected from simulation {simulation_id}")
+        logger.info("Client disconnected from simulation {}", simulation_id)
     except Exception as e:
-        logger.error(f"WebSocket error: {e}")
+        logger.error("WebSocket error: {}", e)
         await manager.send_personal(websocket, {
             "event_type": "error",
             "data": {"message": str(e)}
@@ -226,26 +319,27 @@ async def all_simulations_websocket(websocket: WebSocket):
     Useful for monitoring dashboards.
     """
     await websocket.accept()
-    
+    manager.all_feed.add(websocket)
+
     try:
-        queue = await event_manager.subscribe_all()
-        
+        queue = event_manager.subscribe_all()
+
         try:
             while True:
-                try:
-                    event = await asyncio.wait_for(queue.get(), timeout=30.0)
-                    await websocket.send_json(event)
-                except asyncio.TimeoutError:
-                    # Send heartbeat
-                    await websocket.send_json({"event_type": "heartbeat"})
-                    
+                # The event manager pre-serializes global-feed events, so
+                # every item is ready-to-send bytes
+                for payload in await queue.get():
+                    await websocket.send_bytes(payload)
+
         finally:
-            await event_manager.unsubscribe("*", queue)
+            event_manager.unsubscribe("*", queue)
             
     except WebSocketDisconnect:
         logger.info("Client disconnected from all-simulations feed")
     except Exception as e:
-        logger.error(f"WebSocket error: {e}")
+        logger.error("WebSocket error: {}", e)
+    finally:
+        manager.all_feed.discard(websocket)
 
 
 @router.get("/connections")
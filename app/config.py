@@ -5,7 +5,7 @@ Configuration management for Geant4 API.
 import os
 from pathlib import Path
 from typing import Optional
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
 
 
@@ -62,15 +62,22 @@ class Settings(BaseSettings):
     log_level: str = Field(default="INFO", description="Log level")
     log_file: Optional[str] = Field(default=None, description="Log file path")
     
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = False
+    # Frozen so pydantic-core can skip per-access validation hooks;
+    # settings are process-static after startup anyway
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        frozen=True
+    )
 
 
 # Global settings instance
 settings = Settings()
 
+# Resolved once; avoids rebuilding a Path from the string on every use
+RESULTS_PATH: Path = Path(settings.results_path)
+
 
 def setup_geant4_environment():
     """Set up Geant4 environment variables."""
@@ -81,5 +88,5 @@ def setup_geant4_environment():
         os.environ["GEANT4_DATA_DIR"] = settings.geant4_data_path
         
     # Ensure results directory exists
-    Path(settings.results_path).mkdir(parents=True, exist_ok=True)
+    RESULTS_PATH.mkdir(parents=True, exist_ok=True)
 
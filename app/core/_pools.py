@@ -0,0 +1,25 @@
+"""
+Shared executor pools for blocking work.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config import settings
+
+
+# Dedicated pool for blocking simulation-engine calls so they never
+# compete with Starlette's default threadpool (or the event loop)
+engine_pool = ThreadPoolExecutor(
+    max_workers=settings.max_concurrent_simulations,
+    thread_name_prefix="engine"
+)
+
+
+async def run_in_engine_pool(fn, *args, **kwargs):
+    """Run a blocking engine call on the dedicated pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        engine_pool, functools.partial(fn, *args, **kwargs)
+    )
@@ -3,10 +3,13 @@ Event manager for handling simulation events and callbacks.
 """
 
 import asyncio
+import itertools
+import time
+from collections import defaultdict, deque
 from typing import Dict, List, Callable, Any, Optional
 from datetime import datetime
 from loguru import logger
-import json
+import orjson
 
 
 class EventManager:
@@ -19,86 +22,255 @@ class EventManager:
     - Buffered event history
     """
     
+    # Per-subscriber ring size; a consumer this far behind starts losing
+    # its oldest events instead of stalling the publisher
+    QUEUE_MAXSIZE = 1024
+
+    # Publish-side batching window: events landing within this span are
+    # delivered together, one queue put per subscriber per window
+    FLUSH_INTERVAL = 0.005
+
     def __init__(self, max_history: int = 1000):
-        self._subscribers: Dict[str, List[asyncio.Queue]] = {}
-        self._event_history: List[Dict[str, Any]] = []
+        # Each subscriber is a (queue, include_hits) pair; hit stripping
+        # happens once at publish time rather than per consumer
+        self._subscribers: Dict[str, List[tuple]] = {}
+        # Ring buffer: the deque evicts the oldest event in O(1) instead
+        # of a full reslice once the history is warm
+        self._event_history: deque = deque(maxlen=max_history)
         self._max_history = max_history
-        self._lock = asyncio.Lock()
-    
-    async def subscribe(
-        self, 
+        # Secondary indexes so filtered history lookups walk only
+        # matching events instead of scanning the whole ring
+        self._by_sim: Dict[str, deque] = defaultdict(
+            lambda: deque(maxlen=max_history)
+        )
+        self._by_type: Dict[str, deque] = defaultdict(
+            lambda: deque(maxlen=max_history)
+        )
+        # Events shed from full subscriber rings since startup
+        self.events_dropped = 0
+        # Set False to skip history recording entirely; with no
+        # subscribers either, publish becomes a couple of dict lookups
+        self.history_enabled = True
+        # Events awaiting the next flush, grouped by simulation
+        self._pending: Dict[str, List[Dict[str, Any]]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def subscribe(
+        self,
         simulation_id: str,
-        event_types: Optional[List[str]] = None
+        event_types: Optional[List[str]] = None,
+        include_hits: bool = True
     ) -> asyncio.Queue:
         """
         Subscribe to events for a simulation.
-        
-        Returns a queue that will receive events.
-        """
-        queue: asyncio.Queue = asyncio.Queue()
-        
-        async with self._lock:
-            if simulation_id not in self._subscribers:
-                self._subscribers[simulation_id] = []
-            self._subscribers[simulation_id].append(queue)
-        
-        logger.debug(f"New subscriber for simulation {simulation_id}")
+
+        Returns a queue that will receive events. With include_hits=False
+        the queue receives event_batch payloads with sample_hits removed.
+
+        Plain sync methods: nothing here awaits, and all mutation happens
+        on the event loop thread, so no lock is needed; unsubscribe swaps
+        in a fresh list rather than mutating the one publish may be
+        iterating.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.QUEUE_MAXSIZE)
+
+        self._subscribers.setdefault(simulation_id, []).append(
+            (queue, include_hits)
+        )
+
+        logger.debug("New subscriber for simulation {}", simulation_id)
         return queue
-    
-    async def unsubscribe(self, simulation_id: str, queue: asyncio.Queue):
+
+    def unsubscribe(self, simulation_id: str, queue: asyncio.Queue):
         """Unsubscribe from simulation events."""
-        async with self._lock:
-            if simulation_id in self._subscribers:
-                try:
-                    self._subscribers[simulation_id].remove(queue)
-                    if not self._subscribers[simulation_id]:
-                        del self._subscribers[simulation_id]
-                except ValueError:
-                    pass
-        
-        logger.debug(f"Unsubscribed from simulation {simulation_id}")
+        subscribers = self._subscribers.get(simulation_id)
+        if subscribers is not None:
+            remaining = [s for s in subscribers if s[0] is not queue]
+            if remaining:
+                self._subscribers[simulation_id] = remaining
+            else:
+                self._subscribers.pop(simulation_id, None)
+
+        logger.debug("Unsubscribed from simulation {}", simulation_id)
     
     async def publish(
-        self, 
-        simulation_id: str, 
-        event_type: str, 
+        self,
+        simulation_id: str,
+        event_type: str,
         data: Dict[str, Any]
     ):
         """
         Publish an event to all subscribers.
+
+        Delivery is batched: events published within FLUSH_INTERVAL are
+        handed to each subscriber as one list, so a burst costs one queue
+        put and one consumer wakeup instead of one per event.
+
+        With no subscribers on this simulation or the global feed, and
+        history disabled, this is a no-op.
         """
+        has_subscribers = (
+            simulation_id in self._subscribers or "*" in self._subscribers
+        )
+        if not has_subscribers and not self.history_enabled:
+            return
+
         event = {
             "simulation_id": simulation_id,
             "event_type": event_type,
             "data": data,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _timestamp()
         }
-        
-        # Store in history
-        async with self._lock:
+
+        if self.history_enabled:
+            # Store in history; the deques shed their oldest entries
             self._event_history.append(event)
-            if len(self._event_history) > self._max_history:
-                self._event_history = self._event_history[-self._max_history:]
-        
-        # Broadcast to subscribers
-        if simulation_id in self._subscribers:
-            for queue in self._subscribers[simulation_id]:
-                try:
-                    await queue.put(event)
-                except Exception as e:
-                    logger.error(f"Error publishing event: {e}")
-        
-        # Also broadcast to global subscribers
-        if "*" in self._subscribers:
-            for queue in self._subscribers["*"]:
+            self._by_sim[simulation_id].append(event)
+            self._by_type[event_type].append(event)
+
+        if has_subscribers:
+            self._pending.setdefault(simulation_id, []).append(event)
+            if self._flush_task is None:
+                self._flush_task = asyncio.create_task(
+                    self._flush_after_window()
+                )
+
+    async def publish_batch(
+        self,
+        simulation_id: str,
+        events: List[Dict[str, Any]]
+    ):
+        """
+        Publish several events at once, bypassing the flush window.
+
+        Each entry needs "event_type" and "data" keys.
+        """
+        has_subscribers = (
+            simulation_id in self._subscribers or "*" in self._subscribers
+        )
+        if not has_subscribers and not self.history_enabled:
+            return
+
+        timestamp = _timestamp()
+        built = [
+            {
+                "simulation_id": simulation_id,
+                "event_type": e["event_type"],
+                "data": e["data"],
+                "timestamp": timestamp
+            }
+            for e in events
+        ]
+        if self.history_enabled:
+            self._event_history.extend(built)
+            by_sim = self._by_sim[simulation_id]
+            for event in built:
+                by_sim.append(event)
+                self._by_type[event["event_type"]].append(event)
+        if has_subscribers:
+            self._dispatch(simulation_id, built)
+
+    async def _flush_after_window(self):
+        """
+        Deliver everything buffered once the batching window closes.
+
+        The task acts as a single event pump: the first publish of a
+        burst creates it, every later publish (including ones triggered
+        while dispatching) just appends to _pending, and the loop keeps
+        draining window after window until a window ends with nothing
+        buffered. Sustained load therefore costs one live task, not one
+        task creation per window.
+        """
+        while True:
+            await asyncio.sleep(self.FLUSH_INTERVAL)
+            pending, self._pending = self._pending, {}
+            for simulation_id, events in pending.items():
+                self._dispatch(simulation_id, events)
+            if not self._pending:
+                self._flush_task = None
+                return
+
+    def _dispatch(self, simulation_id: str, events: List[Dict[str, Any]]):
+        """
+        Fan a window's events out with one queue put per subscriber.
+
+        Simulation-room subscribers receive event dicts (the WebSocket
+        layer coalesces them before sending); global-feed subscribers
+        receive orjson-encoded bytes, serialized once per window no
+        matter how many feed clients are attached.
+        """
+        # Build the hits-stripped variant at most once per window, never
+        # per subscriber (a shallow per-subscriber copy would also alias
+        # the nested data dicts)
+        stripped = None
+
+        def _variant(include_hits: bool) -> List[Dict[str, Any]]:
+            nonlocal stripped
+            if include_hits:
+                return events
+            if stripped is None:
+                stripped = [
+                    e if "sample_hits" not in e["data"] else {
+                        **e,
+                        "data": {
+                            k: v for k, v in e["data"].items()
+                            if k != "sample_hits"
+                        }
+                    }
+                    for e in events
+                ]
+            return stripped
+
+        # Broadcast to the simulation's subscribers, then the global ones
+        encoded = None
+        for room in (simulation_id, "*"):
+            subscribers = self._subscribers.get(room)
+            if not subscribers:
+                continue
+            for queue, include_hits in subscribers:
                 try:
-                    await queue.put(event)
+                    if room == "*":
+                        if encoded is None:
+                            encoded = [
+                                orjson.dumps(
+                                    e,
+                                    option=orjson.OPT_SERIALIZE_NUMPY
+                                )
+                                for e in events
+                            ]
+                        self._offer(queue, encoded)
+                    else:
+                        self._offer(queue, _variant(include_hits))
                 except Exception as e:
-                    logger.error(f"Error publishing to global subscriber: {e}")
+                    logger.error("Error publishing event: {}", e)
+
+    def _offer(self, queue: asyncio.Queue, item: List[Dict[str, Any]]):
+        """
+        Put without blocking, shedding the oldest buffered batch when a
+        slow subscriber's ring is full.
+        """
+        try:
+            queue.put_nowait(item)
+        except asyncio.QueueFull:
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+            queue.put_nowait(item)
+            self.events_dropped += 1
+            logger.debug(
+                "Dropped oldest batch for a slow subscriber ({} total)",
+                self.events_dropped
+            )
     
-    async def subscribe_all(self) -> asyncio.Queue:
-        """Subscribe to events from all simulations."""
-        return await self.subscribe("*")
+    def subscribe_all(self) -> asyncio.Queue:
+        """
+        Subscribe to events from all simulations.
+
+        The queue receives lists of orjson-encoded bytes, ready to send
+        on a WebSocket without re-serializing per client.
+        """
+        return self.subscribe("*")
     
     def get_history(
         self, 
@@ -109,25 +281,44 @@ class EventManager:
         """
         Get event history with optional filtering.
         """
-        events = self._event_history
-        
-        if simulation_id:
-            events = [e for e in events if e["simulation_id"] == simulation_id]
-        
-        if event_type:
-            events = [e for e in events if e["event_type"] == event_type]
-        
-        return events[-limit:]
+        # Pick the narrowest index for the filters given, then walk it
+        # newest-first and stop at limit
+        if simulation_id and event_type:
+            by_sim = self._by_sim.get(simulation_id, ())
+            by_type = self._by_type.get(event_type, ())
+            if len(by_sim) <= len(by_type):
+                source, key, want = by_sim, "event_type", event_type
+            else:
+                source, key, want = by_type, "simulation_id", simulation_id
+            matches = (e for e in reversed(source) if e[key] == want)
+        elif simulation_id:
+            matches = reversed(self._by_sim.get(simulation_id, ()))
+        elif event_type:
+            matches = reversed(self._by_type.get(event_type, ()))
+        else:
+            matches = reversed(self._event_history)
+        return list(itertools.islice(matches, limit))[::-1]
     
     def clear_history(self, simulation_id: Optional[str] = None):
         """Clear event history."""
         if simulation_id:
-            self._event_history = [
-                e for e in self._event_history 
-                if e["simulation_id"] != simulation_id
-            ]
+            self._event_history = deque(
+                (
+                    e for e in self._event_history
+                    if e["simulation_id"] != simulation_id
+                ),
+                maxlen=self._max_history
+            )
+            self._by_sim.pop(simulation_id, None)
+            for event_type, events in self._by_type.items():
+                self._by_type[event_type] = deque(
+                    (e for e in events if e["simulation_id"] != simulation_id),
+                    maxlen=self._max_history
+                )
         else:
             self._event_history.clear()
+            self._by_sim.clear()
+            self._by_type.clear()
     
     def get_subscriber_count(self, simulation_id: Optional[str] = None) -> int:
         """Get number of active subscribers."""
@@ -136,6 +327,19 @@ class EventManager:
         return sum(len(subs) for subs in self._subscribers.values())
 
 
+# Timestamp memo: bursts of events within the same millisecond share one
+# formatted string instead of paying datetime construction per event
+_ts_cache = [0.0, ""]
+
+
+def _timestamp() -> str:
+    now = time.time()
+    if now - _ts_cache[0] > 0.001:
+        _ts_cache[0] = now
+        _ts_cache[1] = datetime.utcfromtimestamp(now).isoformat()
+    return _ts_cache[1]
+
+
 # Global event manager instance
 event_manager = EventManager()
 
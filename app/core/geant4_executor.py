@@ -15,6 +15,8 @@ import os
 import re
 import subprocess
 import tempfile
+import numpy as np
+import pandas as pd
 from pathlib import Path
 from typing import Optional, Dict, Any, List, AsyncGenerator, Callable
 from datetime import datetime
@@ -41,7 +43,32 @@ class Geant4Environment:
         "G4ENSDFSTATEDATA",
         "G4TENDLDATA",
     ]
-    
+
+    # Data directory name fragments mapped to their environment variable
+    NAME_TO_VAR = {
+        "G4NEUTRONHP": "G4NEUTRONHPDATA",
+        "NeutronHP": "G4NEUTRONHPDATA",
+        "G4EMLOW": "G4LEDATA",
+        "G4LEDATA": "G4LEDATA",
+        "PhotonEvaporation": "G4LEVELGAMMADATA",
+        "RadioactiveDecay": "G4RADIOACTIVEDATA",
+        "G4PARTICLEXS": "G4PARTICLEXSDATA",
+        "G4PII": "G4PIIDATA",
+        "RealSurface": "G4REALSURFACEDATA",
+        "G4SAIDDATA": "G4SAIDXSDATA",
+        "G4ABLA": "G4ABLADATA",
+        "G4INCL": "G4INCLDATA",
+        "G4ENSDFSTATE": "G4ENSDFSTATEDATA",
+        "G4TENDL": "G4TENDLDATA",
+    }
+
+    # All fragments compiled into one alternation, so classifying a
+    # directory name is a single scan instead of one substring check per
+    # fragment. Longer needles sort first so they win at equal offsets.
+    _FRAGMENT_RE = re.compile("|".join(
+        map(re.escape, sorted(NAME_TO_VAR, key=len, reverse=True))
+    ))
+
     def __init__(
         self,
         install_path: Optional[str] = None,
@@ -50,14 +77,21 @@ class Geant4Environment:
         self.install_path = Path(install_path) if install_path else None
         self.data_path = Path(data_path) if data_path else None
         self._env: Dict[str, str] = {}
-        
+        self._cached_env: Optional[Dict[str, str]] = None
+
     def setup(self) -> Dict[str, str]:
         """
         Set up Geant4 environment variables.
         Returns the environment dict to use for subprocess calls.
+
+        The result is memoized: the data-path layout does not change
+        between launches, so the filesystem scan runs once per instance.
         """
+        if self._cached_env is not None:
+            return dict(self._cached_env)
+
         env = os.environ.copy()
-        
+
         if self.install_path:
             # Add Geant4 bin to PATH
             bin_path = self.install_path / "bin"
@@ -76,38 +110,23 @@ class Geant4Environment:
         if self.data_path and self.data_path.exists():
             env["GEANT4_DATA_DIR"] = str(self.data_path)
             
-            # Auto-detect data directories
-            for data_dir in self.data_path.iterdir():
-                if data_dir.is_dir():
-                    name = data_dir.name
+            # Auto-detect data directories; scandir gets the entry type
+            # from the directory listing itself, so no per-entry stat,
+            # and entry.path is already the str the env var needs
+            with os.scandir(self.data_path) as entries:
+                for entry in entries:
+                    # Default follow_symlinks so symlinked data sets
+                    # still count as directories
+                    if not entry.is_dir():
+                        continue
                     # Map directory names to environment variables
-                    if "G4NEUTRONHP" in name or "NeutronHP" in name:
-                        env["G4NEUTRONHPDATA"] = str(data_dir)
-                    elif "G4EMLOW" in name or "G4LEDATA" in name:
-                        env["G4LEDATA"] = str(data_dir)
-                    elif "PhotonEvaporation" in name:
-                        env["G4LEVELGAMMADATA"] = str(data_dir)
-                    elif "RadioactiveDecay" in name:
-                        env["G4RADIOACTIVEDATA"] = str(data_dir)
-                    elif "G4PARTICLEXS" in name:
-                        env["G4PARTICLEXSDATA"] = str(data_dir)
-                    elif "G4PII" in name:
-                        env["G4PIIDATA"] = str(data_dir)
-                    elif "RealSurface" in name:
-                        env["G4REALSURFACEDATA"] = str(data_dir)
-                    elif "G4SAIDDATA" in name:
-                        env["G4SAIDXSDATA"] = str(data_dir)
-                    elif "G4ABLA" in name:
-                        env["G4ABLADATA"] = str(data_dir)
-                    elif "G4INCL" in name:
-                        env["G4INCLDATA"] = str(data_dir)
-                    elif "G4ENSDFSTATE" in name:
-                        env["G4ENSDFSTATEDATA"] = str(data_dir)
-                    elif "G4TENDL" in name:
-                        env["G4TENDLDATA"] = str(data_dir)
-        
+                    match = self._FRAGMENT_RE.search(entry.name)
+                    if match:
+                        env[self.NAME_TO_VAR[match.group()]] = entry.path
+
         self._env = env
-        return env
+        self._cached_env = env
+        return dict(env)
     
     def verify(self) -> Dict[str, Any]:
         """Verify Geant4 installation."""
@@ -138,9 +157,11 @@ class Geant4Environment:
                 issues.append(f"Data path does not exist: {self.data_path}")
             else:
                 info["data_path"] = str(self.data_path)
-                # Count data directories
-                data_dirs = [d for d in self.data_path.iterdir() if d.is_dir()]
-                info["data_directories"] = len(data_dirs)
+                # Count data directories without materializing a list
+                with os.scandir(self.data_path) as entries:
+                    info["data_directories"] = sum(
+                        1 for e in entries if e.is_dir()
+                    )
         else:
             warnings.append("No Geant4 data path configured")
         
@@ -152,6 +173,28 @@ class Geant4Environment:
         }
 
 
+# One compiled alternation classifies a Geant4 output line in a single
+# search instead of up to eight per-line re.search calls. Branch order
+# keeps the original priority: event > run start > hit.
+_OUTPUT_LINE_RE = re.compile(
+    r"(?:(?:>>> Event|---> Event|Processing event)\s+|Event:\s*)(?P<event_id>\d+)"
+    r"|Run\s+\d+\s+starts.*?(?P<run_events>\d+)\s+events"
+    r"|/run/beamOn\s+(?P<beam_on>\d+)"
+    r"|Number of events\s*[=:]\s*(?P<n_events>\d+)"
+    r"|Hit:\s*detector=(?P<detector>\w+)\s+edep=(?P<edep>[\d.]+)",
+    re.IGNORECASE
+)
+
+# Every branch of the alternation contains one of these literals, so a
+# couple of C-level substring scans on the raw bytes reject the bulk of
+# Geant4 chatter before the regex engine ever runs
+_LINE_LITERALS = (b"vent", b"hit:", b"beamon")
+
+
+def _may_match(raw_lower: bytes) -> bool:
+    return any(literal in raw_lower for literal in _LINE_LITERALS)
+
+
 class Geant4Executor:
     """
     Executes real Geant4 simulations.
@@ -165,28 +208,35 @@ class Geant4Executor:
     ):
         self.executable_path = Path(executable_path) if executable_path else None
         self.environment = Geant4Environment(install_path, data_path)
-        self._process: Optional[asyncio.subprocess.Process] = None
+        self._process: Optional[subprocess.Popen] = None
         
     async def run_simulation(
         self,
-        macro_file: Path,
-        work_dir: Path,
-        output_callback: Optional[Callable[[str], None]] = None
+        macro_file: Optional[Path] = None,
+        work_dir: Path = None,
+        output_callback: Optional[Callable[[str], None]] = None,
+        macro_content: Optional[str] = None
     ) -> AsyncGenerator[Dict[str, Any], None]:
         """
-        Run a Geant4 simulation with the given macro file.
-        
+        Run a Geant4 simulation with the given macro.
+
+        Pass macro_content to pipe the macro straight to the process
+        stdin (no temp file round-trip), or macro_file to point at one
+        on disk.
+
         Yields progress updates as the simulation runs.
         """
         if not self.executable_path or not self.executable_path.exists():
             raise ValueError(f"Geant4 executable not found: {self.executable_path}")
-        
+
         # Setup environment
         env = self.environment.setup()
-        
+
         # Build command
-        cmd = [str(self.executable_path), str(macro_file)]
-        
+        cmd = [str(self.executable_path)]
+        if macro_content is None:
+            cmd.append(str(macro_file))
+
         logger.info(f"Starting Geant4: {' '.join(cmd)}")
         logger.info(f"Working directory: {work_dir}")
         
@@ -195,29 +245,51 @@ class Geant4Executor:
             "data": {"status": "starting", "message": "Launching Geant4 process..."}
         }
         
-        # Start process
-        self._process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
+        # Start process; stderr is merged so the reader drains both pipes
+        self._process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE if macro_content is not None else None,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
             cwd=str(work_dir),
-            env=env
+            env=env,
+            # One pipe read covers hundreds of output lines; the
+            # buffered reader splits them in C
+            bufsize=65536
         )
-        
+
+        if macro_content is not None:
+            # Macros are a few KB, well under the pipe buffer, so this
+            # write cannot block the loop
+            self._process.stdin.write(macro_content.encode())
+            self._process.stdin.close()
+
         yield {
             "event_type": "status",
             "data": {"status": "running", "message": "Geant4 process started", "pid": self._process.pid}
         }
-        
+
+        # Read and regex-parse output on a worker thread so the event
+        # loop only wakes for parsed records and stays free for
+        # WebSocket fanout
+        loop = asyncio.get_running_loop()
+        records: asyncio.Queue = asyncio.Queue()
+        reader = loop.run_in_executor(
+            None, self._reader_thread, self._process.stdout, records, loop,
+            output_callback is not None
+        )
+
         # Parse output in real-time
         events_completed = 0
         events_total = 0
         start_time = datetime.now()
-        
-        async for line in self._read_output():
-            # Parse Geant4 output for progress
-            parsed = self._parse_output_line(line)
-            
+
+        while True:
+            record = await records.get()
+            if record is None:
+                break
+            line, parsed = record
+
             if parsed:
                 if parsed.get("type") == "run_start":
                     events_total = parsed.get("events", 0)
@@ -258,9 +330,10 @@ class Geant4Executor:
             # Forward output for logging
             if output_callback:
                 output_callback(line)
-        
+
         # Wait for process to complete
-        return_code = await self._process.wait()
+        await reader
+        return_code = await loop.run_in_executor(None, self._process.wait)
         elapsed = (datetime.now() - start_time).total_seconds()
         
         if return_code == 0:
@@ -284,79 +357,127 @@ class Geant4Executor:
                 }
             }
     
-    async def _read_output(self) -> AsyncGenerator[str, None]:
-        """Read process output line by line."""
-        if not self._process or not self._process.stdout:
-            return
-        
-        while True:
-            line = await self._process.stdout.readline()
-            if not line:
-                break
-            yield line.decode('utf-8', errors='replace').strip()
-    
+    def _reader_thread(
+        self, stdout, out_queue: asyncio.Queue, loop, forward_lines: bool = True
+    ):
+        """
+        Blocking reader run off the event loop.
+
+        Hands (line, parsed) records back through the queue and posts
+        None at end of stream. With forward_lines=False (no output
+        callback registered) non-matching lines are dropped here in the
+        thread: no str allocation, no loop wakeup - the vast majority of
+        Geant4 chatter never touches the event loop.
+        """
+        try:
+            for raw in stdout:
+                # Byte-level literal prefilter: most lines carry none of
+                # the markers and skip the regex entirely
+                matched = _may_match(raw.lower())
+                if not (matched or forward_lines):
+                    continue
+                line = raw.decode('utf-8', errors='replace').strip()
+                parsed = self._parse_output_line(line) if matched else None
+                if parsed is None and not forward_lines:
+                    continue
+                loop.call_soon_threadsafe(out_queue.put_nowait, (line, parsed))
+        finally:
+            loop.call_soon_threadsafe(out_queue.put_nowait, None)
+
+
     def _parse_output_line(self, line: str) -> Optional[Dict[str, Any]]:
         """Parse Geant4 output line for relevant information."""
-        
-        # Match event processing output
-        # Common formats:
-        # ">>> Event 100" or "Event: 100" or "Processing event 100"
-        event_patterns = [
-            r">>> Event\s+(\d+)",
-            r"Event:\s*(\d+)",
-            r"Processing event\s+(\d+)",
-            r"---> Event\s+(\d+)",
-        ]
-        
-        for pattern in event_patterns:
-            match = re.search(pattern, line, re.IGNORECASE)
-            if match:
-                return {"type": "event", "event_id": int(match.group(1))}
-        
-        # Match run start
-        # "Run 0 starts" or "/run/beamOn 1000"
-        run_patterns = [
-            r"Run\s+\d+\s+starts.*?(\d+)\s+events",
-            r"/run/beamOn\s+(\d+)",
-            r"Number of events\s*[=:]\s*(\d+)",
-        ]
-        
-        for pattern in run_patterns:
-            match = re.search(pattern, line, re.IGNORECASE)
-            if match:
-                return {"type": "run_start", "events": int(match.group(1))}
-        
-        # Match hit data (customize based on your application output)
-        # Example: "Hit: detector=phantom edep=0.523 MeV pos=(10.2, 5.1, 100.3)"
-        hit_pattern = r"Hit:\s*detector=(\w+)\s+edep=([\d.]+)"
-        match = re.search(hit_pattern, line, re.IGNORECASE)
-        if match:
-            return {
-                "type": "hit",
-                "detector": match.group(1),
-                "energy_deposit": float(match.group(2))
-            }
-        
-        return None
+        # Covered formats:
+        # ">>> Event 100" / "Event: 100" / "Processing event 100"
+        # "Run 0 starts ... 1000 events" / "/run/beamOn 1000"
+        # "Hit: detector=phantom edep=0.523 MeV pos=(10.2, 5.1, 100.3)"
+        match = _OUTPUT_LINE_RE.search(line)
+        if not match:
+            return None
+
+        event_id = match.group("event_id")
+        if event_id is not None:
+            return {"type": "event", "event_id": int(event_id)}
+
+        events = (
+            match.group("run_events")
+            or match.group("beam_on")
+            or match.group("n_events")
+        )
+        if events is not None:
+            return {"type": "run_start", "events": int(events)}
+
+        return {
+            "type": "hit",
+            "detector": match.group("detector"),
+            "energy_deposit": float(match.group("edep"))
+        }
     
     async def terminate(self):
         """Terminate the running process."""
         if self._process:
             self._process.terminate()
-            await self._process.wait()
+            await asyncio.get_running_loop().run_in_executor(
+                None, self._process.wait
+            )
             self._process = None
-    
+
     async def kill(self):
         """Kill the running process immediately."""
         if self._process:
             self._process.kill()
-            await self._process.wait()
+            await asyncio.get_running_loop().run_in_executor(
+                None, self._process.wait
+            )
             self._process = None
 
 
+# Macro blocks are fixed templates; generate_full_macro fills them and
+# joins a handful of pre-built block strings instead of appending the
+# file line by line
+_MACRO_HEADER = """\
+# ============================================
+# Geant4 Macro - Auto-generated by Geant4 API
+# Generated: {timestamp}
+# ============================================
+
+# Verbosity
+/control/verbose {verbose}
+/run/verbose {verbose}
+/event/verbose {verbose}
+/tracking/verbose {tracking_verbose}
+"""
+
+_MACRO_GDML = """\
+# Geometry from GDML
+# /persistency/gdml/read {gdml_file}
+"""
+
+_MACRO_PHYSICS = """\
+# Physics cuts
+/run/setCut {default_cut} mm
+"""
+
+_MACRO_PRODUCTION_CUTS = """\
+/run/setCutForAGivenParticle gamma {gamma:.4f} mm
+/run/setCutForAGivenParticle e- {electron:.4f} mm
+/run/setCutForAGivenParticle e+ {positron:.4f} mm
+/run/setCutForAGivenParticle proton {proton:.4f} mm
+"""
+
+_MACRO_FOOTER = """\
+# Output settings
+# /analysis/setFileName output
+# /analysis/h1/set 1 100 0. 10. MeV
+
+# Start simulation
+/run/beamOn {num_events}
+"""
+
+
 class MacroGenerator:
     """Generates Geant4 macro files from API configurations."""
-    
+
     @staticmethod
     def generate_full_macro(
         geometry_config: Optional[Dict] = None,
@@ -366,147 +487,114 @@ class MacroGenerator:
         gdml_file: Optional[str] = None
     ) -> str:
         """Generate a complete Geant4 macro file."""
-        lines = [
-            "# ============================================",
-            "# Geant4 Macro - Auto-generated by Geant4 API",
-            f"# Generated: {datetime.now().isoformat()}",
-            "# ============================================",
-            "",
-        ]
-        
-        # Verbosity settings
         sim = simulation_config or {}
-        verbose = sim.get("verbose_level", 0)
-        tracking_verbose = sim.get("tracking_verbose", 0)
-        
-        lines.extend([
-            "# Verbosity",
-            f"/control/verbose {verbose}",
-            f"/run/verbose {verbose}",
-            f"/event/verbose {verbose}",
-            f"/tracking/verbose {tracking_verbose}",
-            "",
-        ])
-        
+
+        blocks = [_MACRO_HEADER.format(
+            timestamp=datetime.now().isoformat(),
+            verbose=sim.get("verbose_level", 0),
+            tracking_verbose=sim.get("tracking_verbose", 0)
+        )]
+
         # GDML geometry loading (if provided)
         if gdml_file:
-            lines.extend([
-                "# Geometry from GDML",
-                f'# /persistency/gdml/read {gdml_file}',
-                "",
-            ])
-        
+            blocks.append(_MACRO_GDML.format(gdml_file=gdml_file))
+
         # Physics cuts
         if physics_config:
-            physics = physics_config
-            default_cut = physics.get("default_cut", 1.0)
-            lines.extend([
-                "# Physics cuts",
-                f"/run/setCut {default_cut} mm",
-                "",
-            ])
-            
+            blocks.append(_MACRO_PHYSICS.format(
+                default_cut=physics_config.get("default_cut", 1.0)
+            ))
+
             # Production cuts by particle
-            if physics.get("production_cuts"):
-                cuts = physics["production_cuts"]
-                lines.append("/run/setCutForAGivenParticle gamma {:.4f} mm".format(cuts.get("gamma", 1.0)))
-                lines.append("/run/setCutForAGivenParticle e- {:.4f} mm".format(cuts.get("electron", 1.0)))
-                lines.append("/run/setCutForAGivenParticle e+ {:.4f} mm".format(cuts.get("positron", 1.0)))
-                lines.append("/run/setCutForAGivenParticle proton {:.4f} mm".format(cuts.get("proton", 1.0)))
-                lines.append("")
-        
+            if physics_config.get("production_cuts"):
+                cuts = physics_config["production_cuts"]
+                blocks[-1] = blocks[-1] + "\n" + _MACRO_PRODUCTION_CUTS.format(
+                    gamma=cuts.get("gamma", 1.0),
+                    electron=cuts.get("electron", 1.0),
+                    positron=cuts.get("positron", 1.0),
+                    proton=cuts.get("proton", 1.0)
+                )
+
         # Initialize run manager
-        lines.extend([
-            "# Initialize",
-            "/run/initialize",
-            "",
-        ])
-        
-        # Particle source (GPS)
+        blocks.append("# Initialize\n/run/initialize\n")
+
+        # Particle source (GPS); the branchy distribution handling stays
+        # line-based, but the lines collapse into one block string
         if source_config:
-            source = source_config
-            particle = source.get("particle", "gamma")
-            
-            lines.extend([
-                "# Particle source (GPS)",
-                f"/gps/particle {particle}",
-            ])
-            
-            # Energy
-            energy = source.get("energy", {})
-            distribution = energy.get("distribution", "mono")
-            energy_value = energy.get("value", 1.0)
-            
-            if distribution == "mono":
-                lines.append("/gps/ene/type Mono")
-                lines.append(f"/gps/ene/mono {energy_value} MeV")
-            elif distribution == "gaussian":
-                lines.append("/gps/ene/type Gauss")
-                lines.append(f"/gps/ene/mono {energy_value} MeV")
-                sigma = energy.get("sigma", energy_value * 0.01)
-                lines.append(f"/gps/ene/sigma {sigma} MeV")
-            elif distribution == "flat":
-                lines.append("/gps/ene/type Lin")
-                lines.append(f"/gps/ene/min {energy.get('min_energy', 0.1)} MeV")
-                lines.append(f"/gps/ene/max {energy.get('max_energy', 10.0)} MeV")
-                lines.append("/gps/ene/gradient 0")
-                lines.append("/gps/ene/intercept 1")
-            
-            # Position
-            position = source.get("position", {})
-            pos_dist = position.get("distribution", "point")
-            center = position.get("center", {"x": 0, "y": 0, "z": 0})
-            
-            if pos_dist == "point":
-                lines.append("/gps/pos/type Point")
-            elif pos_dist == "plane":
-                lines.append("/gps/pos/type Plane")
-                lines.append("/gps/pos/shape Rectangle")
-                if position.get("half_x"):
-                    lines.append(f"/gps/pos/halfx {position['half_x']} mm")
-                if position.get("half_y"):
-                    lines.append(f"/gps/pos/halfy {position['half_y']} mm")
-            elif pos_dist == "volume":
-                lines.append("/gps/pos/type Volume")
-                lines.append("/gps/pos/shape Para")
-            
-            lines.append(f"/gps/pos/centre {center.get('x', 0)} {center.get('y', 0)} {center.get('z', 0)} mm")
-            
-            # Direction
-            direction = source.get("direction", {})
-            dir_dist = direction.get("distribution", "directed")
-            dir_vec = direction.get("direction", {"x": 0, "y": 0, "z": 1})
-            
-            if dir_dist == "directed":
-                lines.append(f"/gps/direction {dir_vec.get('x', 0)} {dir_vec.get('y', 0)} {dir_vec.get('z', 1)}")
-            elif dir_dist == "isotropic":
-                lines.append("/gps/ang/type iso")
-            elif dir_dist == "cone":
-                lines.append("/gps/ang/type focused")
-                lines.append(f"/gps/ang/focuspoint {dir_vec.get('x', 0)} {dir_vec.get('y', 0)} {dir_vec.get('z', 0)} mm")
-                if direction.get("cone_angle"):
-                    lines.append(f"/gps/ang/maxtheta {direction['cone_angle']} deg")
-            
-            lines.append("")
-        
-        # Run simulation
-        num_events = sim.get("num_events", 1000)
-        
-        # Optional: output commands (depends on your application)
-        lines.extend([
-            "# Output settings",
-            "# /analysis/setFileName output",
-            "# /analysis/h1/set 1 100 0. 10. MeV",
-            "",
-        ])
-        
-        lines.extend([
-            "# Start simulation",
-            f"/run/beamOn {num_events}",
-            "",
-        ])
-        
-        return "\n".join(lines)
+            blocks.append(
+                "\n".join(MacroGenerator._gps_lines(source_config)) + "\n"
+            )
+
+        blocks.append(_MACRO_FOOTER.format(
+            num_events=sim.get("num_events", 1000)
+        ))
+
+        return "\n".join(blocks)
+
+    @staticmethod
+    def _gps_lines(source: Dict) -> List[str]:
+        """Build the GPS command lines for a source configuration."""
+        lines = [
+            "# Particle source (GPS)",
+            f"/gps/particle {source.get('particle', 'gamma')}",
+        ]
+
+        # Energy
+        energy = source.get("energy", {})
+        distribution = energy.get("distribution", "mono")
+        energy_value = energy.get("value", 1.0)
+
+        if distribution == "mono":
+            lines.append("/gps/ene/type Mono")
+            lines.append(f"/gps/ene/mono {energy_value} MeV")
+        elif distribution == "gaussian":
+            lines.append("/gps/ene/type Gauss")
+            lines.append(f"/gps/ene/mono {energy_value} MeV")
+            sigma = energy.get("sigma", energy_value * 0.01)
+            lines.append(f"/gps/ene/sigma {sigma} MeV")
+        elif distribution == "flat":
+            lines.append("/gps/ene/type Lin")
+            lines.append(f"/gps/ene/min {energy.get('min_energy', 0.1)} MeV")
+            lines.append(f"/gps/ene/max {energy.get('max_energy', 10.0)} MeV")
+            lines.append("/gps/ene/gradient 0")
+            lines.append("/gps/ene/intercept 1")
+
+        # Position
+        position = source.get("position", {})
+        pos_dist = position.get("distribution", "point")
+        center = position.get("center", {"x": 0, "y": 0, "z": 0})
+
+        if pos_dist == "point":
+            lines.append("/gps/pos/type Point")
+        elif pos_dist == "plane":
+            lines.append("/gps/pos/type Plane")
+            lines.append("/gps/pos/shape Rectangle")
+            if position.get("half_x"):
+                lines.append(f"/gps/pos/halfx {position['half_x']} mm")
+            if position.get("half_y"):
+                lines.append(f"/gps/pos/halfy {position['half_y']} mm")
+        elif pos_dist == "volume":
+            lines.append("/gps/pos/type Volume")
+            lines.append("/gps/pos/shape Para")
+
+        lines.append(f"/gps/pos/centre {center.get('x', 0)} {center.get('y', 0)} {center.get('z', 0)} mm")
+
+        # Direction
+        direction = source.get("direction", {})
+        dir_dist = direction.get("distribution", "directed")
+        dir_vec = direction.get("direction", {"x": 0, "y": 0, "z": 1})
+
+        if dir_dist == "directed":
+            lines.append(f"/gps/direction {dir_vec.get('x', 0)} {dir_vec.get('y', 0)} {dir_vec.get('z', 1)}")
+        elif dir_dist == "isotropic":
+            lines.append("/gps/ang/type iso")
+        elif dir_dist == "cone":
+            lines.append("/gps/ang/type focused")
+            lines.append(f"/gps/ang/focuspoint {dir_vec.get('x', 0)} {dir_vec.get('y', 0)} {dir_vec.get('z', 0)} mm")
+            if direction.get("cone_angle"):
+                lines.append(f"/gps/ang/maxtheta {direction['cone_angle']} deg")
+
+        return lines
     
     @staticmethod
     def save_macro(content: str, path: Path) -> Path:
@@ -519,59 +607,64 @@ class MacroGenerator:
 class OutputParser:
     """Parses Geant4 output files (ROOT, CSV, ASCII)."""
     
+    @staticmethod
+    def parse_csv_frame(file_path: Path) -> pd.DataFrame:
+        """
+        Parse a CSV output file into a DataFrame.
+
+        This is the fast path: pandas' C reader infers the numeric
+        columns in bulk instead of a float() try/except per cell.
+        """
+        return pd.read_csv(file_path)
+
+    @staticmethod
+    def iter_csv_chunks(file_path: Path, chunk_size: int = 100_000):
+        """
+        Stream a large CSV output file as DataFrame chunks.
+
+        Keeps peak memory bounded for scoring files that do not fit in
+        RAM.
+        """
+        return pd.read_csv(file_path, chunksize=chunk_size)
+
     @staticmethod
     def parse_csv(file_path: Path) -> List[Dict[str, Any]]:
-        """Parse CSV output file."""
-        import csv
-        
-        results = []
-        with open(file_path, 'r') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                # Convert numeric values
-                parsed_row = {}
-                for key, value in row.items():
-                    try:
-                        parsed_row[key] = float(value)
-                    except (ValueError, TypeError):
-                        parsed_row[key] = value
-                results.append(parsed_row)
-        
-        return results
-    
+        """Parse CSV output file into per-row dicts."""
+        return OutputParser.parse_csv_frame(file_path).to_dict("records")
+
     @staticmethod
     def parse_ascii_histogram(file_path: Path) -> Dict[str, Any]:
-        """Parse ASCII histogram file from Geant4 analysis."""
-        with open(file_path, 'r') as f:
-            lines = f.readlines()
-        
-        # Parse header
+        """
+        Parse ASCII histogram file from Geant4 analysis.
+
+        Returns the comment header plus the bin columns as numpy arrays
+        ("x" and "y") loaded in one vectorized pass.
+        """
+        # Parse header comments
         header = {}
-        data = []
-        in_data = False
-        
-        for line in lines:
-            line = line.strip()
-            if not line or line.startswith('#'):
-                # Parse header comments
+        with open(file_path, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    break
                 if '=' in line:
                     key, value = line.split('=', 1)
                     header[key.strip('# ')] = value.strip()
-                continue
-            
-            # Data line
-            parts = line.split()
-            if len(parts) >= 2:
-                try:
-                    x = float(parts[0])
-                    y = float(parts[1])
-                    data.append({"x": x, "y": y})
-                except ValueError:
-                    continue
-        
+
+        try:
+            data = np.loadtxt(file_path, comments='#', ndmin=2)
+        except ValueError:
+            data = np.empty((0, 2))
+
+        if data.size == 0 or data.shape[1] < 2:
+            x = y = np.empty(0)
+        else:
+            x, y = data[:, 0], data[:, 1]
+
         return {
             "header": header,
-            "data": data
+            "x": x,
+            "y": y
         }
     
     @staticmethod
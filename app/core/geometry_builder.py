@@ -2,7 +2,11 @@
 Geometry builder for constructing Geant4 detector geometries.
 """
 
-from typing import Dict, Any, Optional, List
+import sys
+import numpy as np
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, KeysView, Optional, List
 from pathlib import Path
 from loguru import logger
 import json
@@ -14,6 +18,49 @@ from app.models.geometry import (
 )
 
 
+# Standard G4 material names, built once instead of per validation call;
+# interned so membership tests against interned volume materials resolve
+# by identity
+_KNOWN_MATERIALS = frozenset(sys.intern(m.value) for m in MaterialType)
+
+# Static GDML skeleton pieces, parsed once at import; _build_gdml fills
+# the header slots with format_map and appends sections between them
+_GDML_HEADER = '''<?xml version="1.0" encoding="UTF-8"?>
+<gdml xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
+      xsi:noNamespaceSchemaLocation="http://service-spi.web.cern.ch/service-spi/app/releases/GDML/schema/gdml.xsd">
+
+<!-- Geometry: {name} -->
+<!-- {description} -->
+
+<define>'''
+
+_GDML_FOOTER = '''</structure>
+
+<setup name="Default" version="1.0">
+    <world ref="World_LV"/>
+</setup>
+
+</gdml>'''
+
+# Per-volume structure fragments; the {aux}/{rotation} slots carry the
+# optional lines (with their leading newline) or stay empty, so each
+# volume costs one format + one append instead of a line-by-line loop
+_GDML_VOLUME = '''    <volume name="{name}_LV">
+        <materialref ref="{material}"/>
+        <solidref ref="{solid}_solid"/>{aux}
+    </volume>
+'''
+
+_GDML_AUX_SENSDET = '\n        <auxiliary auxtype="SensDet" auxvalue="{name}"/>'
+
+_GDML_PHYSVOL = '''        <physvol name="{name}_PV">
+            <volumeref ref="{name}_LV"/>
+            <positionref ref="{name}_pos"/>{rotation}
+        </physvol>'''
+
+_GDML_ROTATIONREF = '\n            <rotationref ref="{name}_rot"/>'
+
+
 class GeometryBuilder:
     """
     Builds Geant4 detector geometries from configuration.
@@ -49,9 +96,9 @@ class GeometryBuilder:
         """Get a stored geometry configuration."""
         return self.geometries.get(geometry_id)
     
-    def list_geometries(self) -> List[str]:
-        """List all stored geometry IDs."""
-        return list(self.geometries.keys())
+    def list_geometries(self) -> KeysView[str]:
+        """List all stored geometry IDs as a lazy dict view."""
+        return self.geometries.keys()
     
     def delete_geometry(self, geometry_id: str) -> bool:
         """Delete a stored geometry."""
@@ -60,226 +107,249 @@ class GeometryBuilder:
             return True
         return False
     
+    def to_gdml_string(self, geometry: DetectorGeometry) -> str:
+        """
+        Convert geometry configuration to GDML content in memory.
+        """
+        return self._build_gdml(geometry)
+
     def to_gdml(self, geometry: DetectorGeometry, output_path: Path) -> Path:
         """
         Convert geometry configuration to GDML format.
+
+        Fragments are streamed straight into a buffered file handle, so
+        the document is never materialized as one big string on the
+        write path.
         """
-        gdml_content = self._build_gdml(geometry)
-        output_path.write_text(gdml_content)
+        with output_path.open("w", encoding="utf-8", buffering=1 << 20) as fh:
+            first = True
+            for part in self._gdml_parts(geometry):
+                if not first:
+                    fh.write("\n")
+                fh.write(part)
+                first = False
         logger.info(f"Generated GDML: {output_path}")
         return output_path
-    
-    def _build_gdml(self, geometry: DetectorGeometry) -> str:
-        """Build GDML XML content."""
-        
-        # Collect all unique materials
-        materials = self._collect_materials(geometry)
-        
-        # Build GDML structure
-        defines = self._build_gdml_defines(geometry)
-        materials_xml = self._build_gdml_materials(materials)
-        solids = self._build_gdml_solids(geometry)
-        structure = self._build_gdml_structure(geometry)
-        
-        gdml = f'''<?xml version="1.0" encoding="UTF-8"?>
-<gdml xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
-      xsi:noNamespaceSchemaLocation="http://service-spi.web.cern.ch/service-spi/app/releases/GDML/schema/gdml.xsd">
-
-<!-- Geometry: {geometry.name} -->
-<!-- {geometry.description or 'No description'} -->
-
-<define>
-{defines}
-</define>
 
-<materials>
-{materials_xml}
-</materials>
+    def _build_gdml(self, geometry: DetectorGeometry) -> str:
+        """Build GDML XML content as one string."""
+        return "\n".join(self._gdml_parts(geometry))
 
-<solids>
-{solids}
-</solids>
+    def _gdml_parts(self, geometry: DetectorGeometry) -> List[str]:
+        """
+        Build the GDML document as a list of line fragments.
 
-<structure>
-{structure}
-</structure>
+        Every section helper appends lines to one shared list, so the
+        document is produced with a single join (or streamed write)
+        instead of one intermediate string per section interpolated
+        into a template.
+        """
+        # Collect all unique materials
+        materials = self._collect_materials(geometry)
 
-<setup name="Default" version="1.0">
-    <world ref="World_LV"/>
-</setup>
+        out = [_GDML_HEADER.format_map({
+            "name": geometry.name,
+            "description": geometry.description or "No description"
+        })]
+        self._build_gdml_defines(geometry, out)
+        out.append('</define>\n\n<materials>')
+        self._build_gdml_materials(materials, out)
+        out.append('</materials>\n\n<solids>')
+        # Identical shapes share one emitted solid; solid_refs maps each
+        # volume to the canonical solid name its structure entry uses
+        solid_refs = self._build_gdml_solids(geometry, out)
+        out.append('</solids>\n\n<structure>')
+        self._build_gdml_structure(geometry, out, solid_refs)
+        out.append(_GDML_FOOTER)
 
-</gdml>'''
-        
-        return gdml
+        return out
     
     def _collect_materials(self, geometry: DetectorGeometry) -> set:
         """Collect all unique materials used in geometry."""
+        # Explicit stack instead of recursion: no interpreter frame per
+        # volume and no RecursionError on deep hierarchies
         materials = {geometry.world.material}
-        
-        def collect_from_volume(volume: Volume):
+        stack = list(geometry.volumes)
+        while stack:
+            volume = stack.pop()
             materials.add(volume.material)
-            for child in volume.children:
-                collect_from_volume(child)
-        
-        for volume in geometry.volumes:
-            collect_from_volume(volume)
-        
+            stack.extend(volume.children)
         return materials
     
-    def _build_gdml_defines(self, geometry: DetectorGeometry) -> str:
-        """Build GDML defines section."""
-        lines = ['    <position name="center" x="0" y="0" z="0" unit="mm"/>']
-        
+    def _build_gdml_defines(self, geometry: DetectorGeometry, out: List[str]):
+        """Append the GDML defines section to out."""
+        out.append('    <position name="center" x="0" y="0" z="0" unit="mm"/>')
+
         # Add positions for each volume
-        for i, volume in enumerate(geometry.volumes):
+        for volume in geometry.volumes:
             pos = volume.position
-            lines.append(
+            out.append(
                 f'    <position name="{volume.name}_pos" '
                 f'x="{pos.x}" y="{pos.y}" z="{pos.z}" unit="mm"/>'
             )
-            
-            rot = volume.rotation
-            if rot.x != 0 or rot.y != 0 or rot.z != 0:
-                lines.append(
+
+            if volume.has_rotation:
+                rot = volume.rotation
+                out.append(
                     f'    <rotation name="{volume.name}_rot" '
                     f'x="{rot.x}" y="{rot.y}" z="{rot.z}" unit="deg"/>'
                 )
-        
-        return "\n".join(lines)
-    
-    def _build_gdml_materials(self, materials: set) -> str:
-        """Build GDML materials section using NIST references."""
-        lines = []
+
+    def _build_gdml_materials(self, materials: set, out: List[str]):
+        """Append the GDML materials section (NIST references) to out."""
         for mat in materials:
             # Use NIST material database reference
-            lines.append(f'    <material name="{mat}" Z="1">')
-            lines.append(f'        <D value="1.0"/>')
-            lines.append(f'        <atom value="1.0"/>')
-            lines.append(f'    </material>')
-        return "\n".join(lines)
-    
-    def _build_gdml_solids(self, geometry: DetectorGeometry) -> str:
-        """Build GDML solids section."""
-        lines = []
-        
+            out.append(f'    <material name="{mat}" Z="1">')
+            out.append('        <D value="1.0"/>')
+            out.append('        <atom value="1.0"/>')
+            out.append('    </material>')
+
+    def _build_gdml_solids(
+        self, geometry: DetectorGeometry, out: List[str]
+    ) -> Dict[str, str]:
+        """
+        Append the GDML solids section to out.
+
+        Volumes sharing an identical shape get one emitted solid; returns
+        a map of volume name to the canonical solid owner's name.
+        """
         # World solid
         w = geometry.world
-        lines.append(
+        out.append(
             f'    <box name="World_solid" '
-            f'x="{w.half_x * 2}" y="{w.half_y * 2}" z="{w.half_z * 2}" lunit="mm"/>'
+            f'x="{w.full_x}" y="{w.full_y}" z="{w.full_z}" lunit="mm"/>'
         )
-        
-        # Volume solids
+
+        # Volume solids, deduplicated by dimension signature
+        seen: Dict[tuple, str] = {}
+        solid_refs: Dict[str, str] = {}
         for volume in geometry.volumes:
-            solid_xml = self._solid_to_gdml(volume.name, volume.solid)
-            lines.append(solid_xml)
-        
-        return "\n".join(lines)
-    
-    def _solid_to_gdml(self, name: str, solid) -> str:
-        """Convert a solid to GDML XML."""
+            solid = volume.solid
+            key = (solid.type, *self._solid_dims(solid))
+            canonical = seen.get(key)
+            if canonical is None:
+                seen[key] = canonical = volume.name
+                out.append(self._solid_to_gdml(volume.name, solid))
+            solid_refs[volume.name] = canonical
+        return solid_refs
+
+    @staticmethod
+    def _solid_dims(solid) -> tuple:
+        """The dimension signature of a solid, in GDML emission order."""
         if solid.type == "box":
-            return (
-                f'    <box name="{name}_solid" '
-                f'x="{solid.half_x * 2}" y="{solid.half_y * 2}" '
-                f'z="{solid.half_z * 2}" lunit="mm"/>'
-            )
+            return (solid.full_x, solid.full_y, solid.full_z)
         elif solid.type == "cylinder":
             return (
-                f'    <tube name="{name}_solid" '
-                f'rmin="{solid.inner_radius}" rmax="{solid.outer_radius}" '
-                f'z="{solid.half_z * 2}" '
-                f'startphi="{solid.start_phi}" deltaphi="{solid.delta_phi}" '
-                f'aunit="deg" lunit="mm"/>'
+                solid.inner_radius, solid.outer_radius, solid.full_z,
+                solid.start_phi, solid.delta_phi
             )
         elif solid.type == "sphere":
             return (
-                f'    <sphere name="{name}_solid" '
-                f'rmin="{solid.inner_radius}" rmax="{solid.outer_radius}" '
-                f'startphi="{solid.start_phi}" deltaphi="{solid.delta_phi}" '
-                f'starttheta="{solid.start_theta}" deltatheta="{solid.delta_theta}" '
-                f'aunit="deg" lunit="mm"/>'
+                solid.inner_radius, solid.outer_radius,
+                solid.start_phi, solid.delta_phi,
+                solid.start_theta, solid.delta_theta
             )
         elif solid.type == "cone":
             return (
-                f'    <cone name="{name}_solid" '
-                f'rmin1="{solid.inner_radius_1}" rmax1="{solid.outer_radius_1}" '
-                f'rmin2="{solid.inner_radius_2}" rmax2="{solid.outer_radius_2}" '
-                f'z="{solid.half_z * 2}" '
-                f'startphi="0" deltaphi="360" aunit="deg" lunit="mm"/>'
+                solid.inner_radius_1, solid.outer_radius_1,
+                solid.inner_radius_2, solid.outer_radius_2,
+                solid.full_z
             )
         else:
             raise ValueError(f"Unknown solid type: {solid.type}")
+
+    def _solid_to_gdml(self, name: str, solid) -> str:
+        """Convert a solid to GDML XML."""
+        return _solid_fragment(
+            solid.type, *self._solid_dims(solid)
+        ).format(name=name)
     
-    def _build_gdml_structure(self, geometry: DetectorGeometry) -> str:
-        """Build GDML structure section."""
-        lines = []
-        
+    def _build_gdml_structure(
+        self,
+        geometry: DetectorGeometry,
+        out: List[str],
+        solid_refs: Dict[str, str]
+    ):
+        """Append the GDML structure section to out."""
         # Build volume logical volumes first
         for volume in geometry.volumes:
-            lines.append(f'    <volume name="{volume.name}_LV">')
-            lines.append(f'        <materialref ref="{volume.material}"/>')
-            lines.append(f'        <solidref ref="{volume.name}_solid"/>')
-            
-            # Add sensitive detector auxiliary if needed
-            if volume.is_sensitive:
-                lines.append(f'        <auxiliary auxtype="SensDet" auxvalue="{volume.name}"/>')
-            
-            lines.append(f'    </volume>')
-            lines.append('')
-        
+            out.append(_GDML_VOLUME.format(
+                name=volume.name,
+                material=volume.material,
+                solid=solid_refs[volume.name],
+                aux=(
+                    _GDML_AUX_SENSDET.format(name=volume.name)
+                    if volume.is_sensitive else ''
+                ),
+            ))
+
         # World volume with placements
-        lines.append('    <volume name="World_LV">')
-        lines.append(f'        <materialref ref="{geometry.world.material}"/>')
-        lines.append('        <solidref ref="World_solid"/>')
-        
+        out.append('    <volume name="World_LV">')
+        out.append(f'        <materialref ref="{geometry.world.material}"/>')
+        out.append('        <solidref ref="World_solid"/>')
+
         for volume in geometry.volumes:
-            lines.append(f'        <physvol name="{volume.name}_PV">')
-            lines.append(f'            <volumeref ref="{volume.name}_LV"/>')
-            lines.append(f'            <positionref ref="{volume.name}_pos"/>')
-            if volume.rotation.x != 0 or volume.rotation.y != 0 or volume.rotation.z != 0:
-                lines.append(f'            <rotationref ref="{volume.name}_rot"/>')
-            lines.append('        </physvol>')
-        
-        lines.append('    </volume>')
-        
-        return "\n".join(lines)
+            out.append(_GDML_PHYSVOL.format(
+                name=volume.name,
+                rotation=(
+                    _GDML_ROTATIONREF.format(name=volume.name)
+                    if volume.has_rotation else ''
+                ),
+            ))
+
+        out.append('    </volume>')
     
+    @staticmethod
+    def _max_extent(geometry: DetectorGeometry) -> float:
+        """
+        Largest |position| + half-dimension over all volumes.
+
+        Volumes are grouped by solid type into per-axis arrays so the
+        arithmetic runs as a few NumPy passes instead of a Python
+        abs/max pair per volume.
+        """
+        groups: Dict[str, list] = {"box": [], "cylinder": [], "sphere": []}
+        for volume in geometry.volumes:
+            group = groups.get(volume.solid.type)
+            if group is not None:
+                group.append(volume)
+
+        max_extent = 0.0
+        for solid_type, volumes in groups.items():
+            if not volumes:
+                continue
+            n = len(volumes)
+            px = np.fromiter((v.position.x for v in volumes), float, n)
+            py = np.fromiter((v.position.y for v in volumes), float, n)
+            pz = np.fromiter((v.position.z for v in volumes), float, n)
+            if solid_type == "box":
+                hx = np.fromiter((v.solid.half_x for v in volumes), float, n)
+                hy = np.fromiter((v.solid.half_y for v in volumes), float, n)
+                hz = np.fromiter((v.solid.half_z for v in volumes), float, n)
+            elif solid_type == "cylinder":
+                hx = hy = np.fromiter(
+                    (v.solid.outer_radius for v in volumes), float, n
+                )
+                hz = np.fromiter((v.solid.half_z for v in volumes), float, n)
+            else:  # sphere
+                hx = hy = hz = np.fromiter(
+                    (v.solid.outer_radius for v in volumes), float, n
+                )
+            extent = np.maximum.reduce(
+                [np.abs(px) + hx, np.abs(py) + hy, np.abs(pz) + hz]
+            ).max()
+            max_extent = max(max_extent, float(extent))
+
+        return max_extent
+
     def validate_geometry(self, geometry: DetectorGeometry) -> Dict[str, Any]:
         """Validate geometry configuration."""
         issues = []
         warnings = []
-        
+
         # Check world size
-        max_extent = 0
-        for volume in geometry.volumes:
-            pos = volume.position
-            solid = volume.solid
-            
-            # Calculate extent based on solid type
-            if solid.type == "box":
-                extent = max(
-                    abs(pos.x) + solid.half_x,
-                    abs(pos.y) + solid.half_y,
-                    abs(pos.z) + solid.half_z
-                )
-            elif solid.type == "cylinder":
-                extent = max(
-                    abs(pos.x) + solid.outer_radius,
-                    abs(pos.y) + solid.outer_radius,
-                    abs(pos.z) + solid.half_z
-                )
-            elif solid.type == "sphere":
-                extent = max(
-                    abs(pos.x) + solid.outer_radius,
-                    abs(pos.y) + solid.outer_radius,
-                    abs(pos.z) + solid.outer_radius
-                )
-            else:
-                extent = 0
-            
-            max_extent = max(max_extent, extent)
-        
+        max_extent = self._max_extent(geometry)
+
         # Check if world is large enough
         world = geometry.world
         if max_extent > min(world.half_x, world.half_y, world.half_z):
@@ -288,15 +358,19 @@ class GeometryBuilder:
                 f"may be too small for volumes (max extent: {max_extent})"
             )
         
-        # Check for duplicate names
-        names = [v.name for v in geometry.volumes]
-        if len(names) != len(set(names)):
-            issues.append("Duplicate volume names detected")
+        # Check for duplicate names in one pass, naming the offender
+        seen = set()
+        for volume in geometry.volumes:
+            if volume.name in seen:
+                issues.append(
+                    f"Duplicate volume names detected: '{volume.name}'"
+                )
+                break
+            seen.add(volume.name)
         
         # Check materials
-        known_materials = {m.value for m in MaterialType}
         for volume in geometry.volumes:
-            if volume.material not in known_materials:
+            if volume.material not in _KNOWN_MATERIALS:
                 warnings.append(
                     f"Material '{volume.material}' for volume '{volume.name}' "
                     f"is not a standard G4 material"
@@ -309,8 +383,54 @@ class GeometryBuilder:
         }
 
 
-# Predefined geometry templates
-GEOMETRY_TEMPLATES = {
+@lru_cache(maxsize=4096)
+def _solid_fragment(solid_type: str, *dims) -> str:
+    """
+    Format a solid's GDML fragment with a {name} placeholder.
+
+    Detectors often repeat one shape across many volumes (crystal
+    arrays), so the formatted fragment is cached by its dimension
+    signature and only the name differs per volume.
+    """
+    if solid_type == "box":
+        x, y, z = dims
+        return (
+            f'    <box name="{{name}}_solid" '
+            f'x="{x}" y="{y}" '
+            f'z="{z}" lunit="mm"/>'
+        )
+    if solid_type == "cylinder":
+        rmin, rmax, z, startphi, deltaphi = dims
+        return (
+            f'    <tube name="{{name}}_solid" '
+            f'rmin="{rmin}" rmax="{rmax}" '
+            f'z="{z}" '
+            f'startphi="{startphi}" deltaphi="{deltaphi}" '
+            f'aunit="deg" lunit="mm"/>'
+        )
+    if solid_type == "sphere":
+        rmin, rmax, startphi, deltaphi, starttheta, deltatheta = dims
+        return (
+            f'    <sphere name="{{name}}_solid" '
+            f'rmin="{rmin}" rmax="{rmax}" '
+            f'startphi="{startphi}" deltaphi="{deltaphi}" '
+            f'starttheta="{starttheta}" deltatheta="{deltatheta}" '
+            f'aunit="deg" lunit="mm"/>'
+        )
+    # cone
+    rmin1, rmax1, rmin2, rmax2, z = dims
+    return (
+        f'    <cone name="{{name}}_solid" '
+        f'rmin1="{rmin1}" rmax1="{rmax1}" '
+        f'rmin2="{rmin2}" rmax2="{rmax2}" '
+        f'z="{z}" '
+        f'startphi="0" deltaphi="360" aunit="deg" lunit="mm"/>'
+    )
+
+
+# Predefined geometry templates; the mapping proxy makes the registry
+# read-only so handlers cannot accidentally swap or delete entries
+GEOMETRY_TEMPLATES = MappingProxyType({
     "water_phantom": DetectorGeometry(
         name="water_phantom",
         description="Simple water phantom for dosimetry",
@@ -375,7 +495,7 @@ GEOMETRY_TEMPLATES = {
             )
         ]
     )
-}
+})
 
 
 # Global geometry builder instance
@@ -2,7 +2,9 @@
 Physics list builder for Geant4 simulations.
 """
 
-from typing import Dict, Optional, List, Any
+import re
+from types import MappingProxyType
+from typing import Dict, KeysView, Optional, List, Any
 from loguru import logger
 
 from app.models.physics import (
@@ -11,6 +13,85 @@ from app.models.physics import (
 )
 
 
+# Application keywords for recommend_physics_list, each category
+# compiled into one alternation so classification is a single scan
+# rather than a substring check per keyword
+_MEDICAL_RE = re.compile(r"medical|therapy|dosimetry")
+_SHIELDING_RE = re.compile(r"shielding|radiation protection")
+_XRAY_RE = re.compile(r"xray|x-ray|fluorescence")
+_HEP_RE = re.compile(r"hep|collider")
+
+# Per-particle production-cut commands, one format call each when the
+# config carries explicit cuts
+_CUT_COMMANDS = (
+    "/run/setCutForAGivenParticle gamma {gamma} mm",
+    "/run/setCutForAGivenParticle e- {electron} mm",
+    "/run/setCutForAGivenParticle e+ {positron} mm",
+    "/run/setCutForAGivenParticle proton {proton} mm",
+)
+
+# Static physics-list reference data, built once at import instead of
+# reallocating the nested literals on every info call
+_PHYSICS_LIST_INFO = MappingProxyType({
+    PhysicsListType.FTFP_BERT: {
+        "name": "FTFP_BERT",
+        "description": "Fritiof + Bertini cascade. Good for HEP.",
+        "energy_range": "0 - 100 TeV",
+        "best_for": ["High energy physics", "LHC experiments"],
+        "em_physics": "Standard EM",
+        "hadronic": "FTFP + Bertini"
+    },
+    PhysicsListType.FTFP_BERT_HP: {
+        "name": "FTFP_BERT_HP",
+        "description": "FTFP_BERT with high precision neutron transport",
+        "energy_range": "0 - 100 TeV",
+        "best_for": ["Neutron transport", "Shielding"],
+        "em_physics": "Standard EM",
+        "hadronic": "FTFP + Bertini + NeutronHP"
+    },
+    PhysicsListType.QGSP_BERT: {
+        "name": "QGSP_BERT",
+        "description": "Quark-gluon string + Bertini cascade",
+        "energy_range": "0 - 100 TeV",
+        "best_for": ["General purpose", "Calorimetry"],
+        "em_physics": "Standard EM",
+        "hadronic": "QGSP + Bertini"
+    },
+    PhysicsListType.QGSP_BIC: {
+        "name": "QGSP_BIC",
+        "description": "Quark-gluon string + Binary cascade",
+        "energy_range": "0 - 100 TeV",
+        "best_for": ["Proton therapy", "Nuclear physics"],
+        "em_physics": "Standard EM",
+        "hadronic": "QGSP + Binary"
+    },
+    PhysicsListType.SHIELDING: {
+        "name": "Shielding",
+        "description": "Optimized for shielding calculations",
+        "energy_range": "0 - 100 TeV",
+        "best_for": ["Shielding design", "Radiation protection"],
+        "em_physics": "Standard EM",
+        "hadronic": "FTFP + Bertini + HP"
+    },
+    PhysicsListType.LIVERMORE: {
+        "name": "G4EmLivermorePhysics",
+        "description": "Low energy EM based on Livermore data",
+        "energy_range": "250 eV - 100 GeV",
+        "best_for": ["X-ray applications", "Low energy"],
+        "em_physics": "Livermore",
+        "hadronic": "None (EM only)"
+    },
+    PhysicsListType.PENELOPE: {
+        "name": "G4EmPenelopePhysics",
+        "description": "Low energy EM based on PENELOPE",
+        "energy_range": "100 eV - 1 GeV",
+        "best_for": ["Medical physics", "Microdosimetry"],
+        "em_physics": "Penelope",
+        "hadronic": "None (EM only)"
+    },
+})
+
+
 class PhysicsBuilder:
     """
     Builds Geant4 physics configurations.
@@ -43,9 +124,9 @@ class PhysicsBuilder:
         """Get a stored physics configuration."""
         return self.physics_configs.get(name)
     
-    def list_physics(self) -> List[str]:
-        """List all stored physics configurations."""
-        return list(self.physics_configs.keys())
+    def list_physics(self) -> KeysView[str]:
+        """List all stored physics configurations as a lazy dict view."""
+        return self.physics_configs.keys()
     
     def delete_physics(self, name: str) -> bool:
         """Delete a stored physics configuration."""
@@ -58,105 +139,51 @@ class PhysicsBuilder:
         """
         Convert physics configuration to Geant4 macro commands.
         """
-        commands = [
+        cuts = config.production_cuts
+        # Assembled in one list display so the result is sized in a
+        # single pass instead of append/extend calls per section
+        return [
             "# Physics configuration",
             f"# Physics list: {config.physics_list.value}",
+            # Production cuts
+            f"/run/setCut {config.default_cut} mm",
+            *((
+                template.format(
+                    gamma=cuts.gamma, electron=cuts.electron,
+                    positron=cuts.positron, proton=cuts.proton
+                )
+                for template in _CUT_COMMANDS
+            ) if cuts else ()),
+            # Region cuts
+            *(
+                line
+                for region_cut in config.region_cuts
+                for line in (
+                    f"# Region: {region_cut.region_name}",
+                    f"/run/setCutForRegion {region_cut.region_name} {region_cut.cuts.gamma} mm",
+                )
+            ),
+            # Step limiters
+            *(
+                f"/process/setMaxStep {limiter.max_step} mm {vol}"
+                for limiter in config.step_limiters
+                for vol in limiter.volumes
+            ),
         ]
-        
-        # Production cuts
-        commands.append(f"/run/setCut {config.default_cut} mm")
-        
-        if config.production_cuts:
-            cuts = config.production_cuts
-            commands.extend([
-                f"/run/setCutForAGivenParticle gamma {cuts.gamma} mm",
-                f"/run/setCutForAGivenParticle e- {cuts.electron} mm",
-                f"/run/setCutForAGivenParticle e+ {cuts.positron} mm",
-                f"/run/setCutForAGivenParticle proton {cuts.proton} mm",
-            ])
-        
-        # Region cuts
-        for region_cut in config.region_cuts:
-            commands.append(f"# Region: {region_cut.region_name}")
-            commands.append(f"/run/setCutForRegion {region_cut.region_name} {region_cut.cuts.gamma} mm")
-        
-        # Step limiters
-        for limiter in config.step_limiters:
-            if limiter.volumes:
-                for vol in limiter.volumes:
-                    commands.append(f"/process/setMaxStep {limiter.max_step} mm {vol}")
-        
-        return commands
     
     def get_physics_list_info(self, list_type: PhysicsListType) -> Dict[str, Any]:
         """Get information about a physics list."""
-        info = {
-            PhysicsListType.FTFP_BERT: {
-                "name": "FTFP_BERT",
-                "description": "Fritiof + Bertini cascade. Good for HEP.",
-                "energy_range": "0 - 100 TeV",
-                "best_for": ["High energy physics", "LHC experiments"],
-                "em_physics": "Standard EM",
-                "hadronic": "FTFP + Bertini"
-            },
-            PhysicsListType.FTFP_BERT_HP: {
-                "name": "FTFP_BERT_HP",
-                "description": "FTFP_BERT with high precision neutron transport",
-                "energy_range": "0 - 100 TeV",
-                "best_for": ["Neutron transport", "Shielding"],
-                "em_physics": "Standard EM",
-                "hadronic": "FTFP + Bertini + NeutronHP"
-            },
-            PhysicsListType.QGSP_BERT: {
-                "name": "QGSP_BERT",
-                "description": "Quark-gluon string + Bertini cascade",
-                "energy_range": "0 - 100 TeV",
-                "best_for": ["General purpose", "Calorimetry"],
-                "em_physics": "Standard EM",
-                "hadronic": "QGSP + Bertini"
-            },
-            PhysicsListType.QGSP_BIC: {
-                "name": "QGSP_BIC",
-                "description": "Quark-gluon string + Binary cascade",
-                "energy_range": "0 - 100 TeV",
-                "best_for": ["Proton therapy", "Nuclear physics"],
-                "em_physics": "Standard EM",
-                "hadronic": "QGSP + Binary"
-            },
-            PhysicsListType.SHIELDING: {
-                "name": "Shielding",
-                "description": "Optimized for shielding calculations",
-                "energy_range": "0 - 100 TeV",
-                "best_for": ["Shielding design", "Radiation protection"],
-                "em_physics": "Standard EM",
-                "hadronic": "FTFP + Bertini + HP"
-            },
-            PhysicsListType.LIVERMORE: {
-                "name": "G4EmLivermorePhysics",
-                "description": "Low energy EM based on Livermore data",
-                "energy_range": "250 eV - 100 GeV",
-                "best_for": ["X-ray applications", "Low energy"],
-                "em_physics": "Livermore",
-                "hadronic": "None (EM only)"
-            },
-            PhysicsListType.PENELOPE: {
-                "name": "G4EmPenelopePhysics",
-                "description": "Low energy EM based on PENELOPE",
-                "energy_range": "100 eV - 1 GeV",
-                "best_for": ["Medical physics", "Microdosimetry"],
-                "em_physics": "Penelope",
-                "hadronic": "None (EM only)"
-            },
-        }
-        
-        return info.get(list_type, {
-            "name": list_type.value,
-            "description": "Custom physics list",
-            "energy_range": "Unknown",
-            "best_for": [],
-            "em_physics": "Unknown",
-            "hadronic": "Unknown"
-        })
+        info = _PHYSICS_LIST_INFO.get(list_type)
+        if info is None:
+            return {
+                "name": list_type.value,
+                "description": "Custom physics list",
+                "energy_range": "Unknown",
+                "best_for": [],
+                "em_physics": "Unknown",
+                "hadronic": "Unknown"
+            }
+        return info
     
     def recommend_physics_list(
         self,
@@ -168,32 +195,32 @@ class PhysicsBuilder:
         Recommend a physics list based on application parameters.
         """
         application = application.lower()
-        
+
         # Medical physics
-        if any(x in application for x in ["medical", "therapy", "dosimetry"]):
+        if _MEDICAL_RE.search(application):
             if energy_mev < 10:
                 return PhysicsListType.PENELOPE
             elif "proton" in particles or "ion" in particles:
                 return PhysicsListType.QGSP_BIC
             else:
                 return PhysicsListType.QGSP_BERT
-        
+
         # Shielding
-        if any(x in application for x in ["shielding", "radiation protection"]):
+        if _SHIELDING_RE.search(application):
             return PhysicsListType.SHIELDING
-        
+
         # X-ray / low energy
-        if any(x in application for x in ["xray", "x-ray", "fluorescence"]):
+        if _XRAY_RE.search(application):
             return PhysicsListType.LIVERMORE
-        
+
         # Neutron transport
         if "neutron" in particles:
             return PhysicsListType.FTFP_BERT_HP
-        
+
         # High energy physics
-        if energy_mev > 10000 or any(x in application for x in ["hep", "collider"]):
+        if energy_mev > 10000 or _HEP_RE.search(application):
             return PhysicsListType.FTFP_BERT
-        
+
         # Default
         return PhysicsListType.FTFP_BERT
     
@@ -242,8 +269,9 @@ class PhysicsBuilder:
         }
 
 
-# Predefined physics templates
-PHYSICS_TEMPLATES = {
+# Predefined physics templates; read-only so handlers cannot swap or
+# delete entries
+PHYSICS_TEMPLATES = MappingProxyType({
     "standard": PhysicsConfig(
         physics_list=PhysicsListType.FTFP_BERT,
         em_physics=EMPhysicsOption.STANDARD,
@@ -267,7 +295,7 @@ PHYSICS_TEMPLATES = {
         default_cut=0.01,
         low_energy_limit=0.00025  # 250 eV
     )
-}
+})
 
 
 # Global physics builder instance
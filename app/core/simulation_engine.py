@@ -10,16 +10,18 @@ Supports two modes:
 import asyncio
 import json
 import os
+import random
 import subprocess
 import tempfile
 import time
 import uuid
+import numpy as np
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict, Any, AsyncGenerator, Callable
 from loguru import logger
 
-from app.config import settings
+from app.config import settings, RESULTS_PATH
 from app.models.simulation import (
     SimulationConfig, SimulationStatus, SimulationProgress, SimulationJob
 )
@@ -32,6 +34,12 @@ from app.models.results import SimulationResults, StreamingEvent, HitData
 from app.core.geant4_executor import (
     Geant4Executor, Geant4Environment, MacroGenerator, OutputParser
 )
+from app.core.result_collector import result_collector
+from app.core._pools import run_in_engine_pool
+
+
+# Column order of the float32 sample_hits block in event_batch payloads
+HIT_SAMPLE_COLUMNS = ("event_id", "energy_deposit", "x", "y", "z")
 
 
 class SimulationEngine:
@@ -45,6 +53,10 @@ class SimulationEngine:
     def __init__(self):
         self.active_simulations: Dict[str, SimulationJob] = {}
         self.simulation_processes: Dict[str, subprocess.Popen] = {}
+        # Job ids bucketed by status so filtered listings skip a full scan
+        self._by_status: Dict[SimulationStatus, set] = {
+            status: set() for status in SimulationStatus
+        }
         self._callbacks: Dict[str, list] = {}
         self._use_pybind = not settings.geant4_use_subprocess
         
@@ -169,9 +181,16 @@ class SimulationEngine:
         )
         
         self.active_simulations[job.id] = job
+        self._by_status[job.status].add(job.id)
         logger.info(f"Created simulation job: {job.id} ({job.name})")
-        
+
         return job
+
+    def _set_status(self, job: SimulationJob, status: SimulationStatus):
+        """Update a job's status, keeping the status index in sync."""
+        self._by_status[job.status].discard(job.id)
+        job.status = status
+        self._by_status[status].add(job.id)
     
     async def start_simulation(
         self, 
@@ -187,8 +206,9 @@ class SimulationEngine:
             raise ValueError(f"Simulation {job_id} not found")
         
         job = self.active_simulations[job_id]
-        job.status = SimulationStatus.INITIALIZING
+        self._set_status(job, SimulationStatus.INITIALIZING)
         job.started_at = datetime.utcnow()
+        job.started_monotonic = time.monotonic()
         
         yield StreamingEvent(
             event_type="status",
@@ -205,7 +225,7 @@ class SimulationEngine:
                     yield event
                     
         except Exception as e:
-            job.status = SimulationStatus.FAILED
+            self._set_status(job, SimulationStatus.FAILED)
             job.error_message = str(e)
             logger.error(f"Simulation {job_id} failed: {e}")
             yield StreamingEvent(
@@ -221,24 +241,26 @@ class SimulationEngine:
         """Run simulation using subprocess and macro files."""
         
         # Create working directory for this simulation
-        work_dir = Path(settings.results_path) / job.id
+        work_dir = RESULTS_PATH / job.id
         work_dir.mkdir(parents=True, exist_ok=True)
         
-        # Generate macro file using MacroGenerator
+        # Generate the macro; it is piped straight to the Geant4 stdin
+        # rather than round-tripped through a file on disk
         macro_content = MacroGenerator.generate_full_macro(
             geometry_config=job.geometry_config,
             physics_config=job.physics_config,
             source_config=job.source_config,
             simulation_config=job.config.model_dump()
         )
-        macro_path = work_dir / "run.mac"
-        MacroGenerator.save_macro(macro_content, macro_path)
         
-        # Generate GDML geometry if provided
+        # Generate GDML geometry if provided; the disk write runs on the
+        # engine pool so the event loop is not stalled on file I/O
         gdml_path = None
         if job.geometry_config:
             gdml_path = work_dir / "geometry.gdml"
-            self._generate_gdml(job.geometry_config, gdml_path)
+            await run_in_engine_pool(
+                self._generate_gdml, job.geometry_config, gdml_path
+            )
         
         yield StreamingEvent(
             event_type="status",
@@ -246,7 +268,7 @@ class SimulationEngine:
             data={"status": "running", "message": "Starting Geant4 process..."}
         )
         
-        job.status = SimulationStatus.RUNNING
+        self._set_status(job, SimulationStatus.RUNNING)
         start_time = time.time()
         
         # Check if we have a real Geant4 executor
@@ -265,9 +287,9 @@ class SimulationEngine:
             )
             
             async for event in self._executor.run_simulation(
-                macro_file=macro_path,
                 work_dir=work_dir,
-                output_callback=lambda line: logger.debug(f"G4: {line}")
+                output_callback=lambda line: logger.debug(f"G4: {line}"),
+                macro_content=macro_content
             ):
                 # Update job status based on events
                 if event.get("event_type") == "progress":
@@ -342,12 +364,15 @@ class SimulationEngine:
                     data={
                         "batch_start": i,
                         "batch_end": events_done,
+                        "detector": "detector_0",
+                        "particle": "gamma",
+                        "hit_columns": HIT_SAMPLE_COLUMNS,
                         "sample_hits": self._generate_sample_hits(i, batch_size)
                     }
                 )
         
         # Simulation complete
-        job.status = SimulationStatus.COMPLETED
+        self._set_status(job, SimulationStatus.COMPLETED)
         job.completed_at = datetime.utcnow()
         job.result_path = str(work_dir)
         
@@ -473,26 +498,24 @@ class SimulationEngine:
         logger.debug(f"Generated GDML file: {path}")
     
     def _generate_sample_hits(
-        self, 
-        start_event: int, 
+        self,
+        start_event: int,
         batch_size: int
-    ) -> list:
-        """Generate sample hit data for demonstration."""
-        import random
-        
-        hits = []
-        for i in range(min(10, batch_size)):  # Sample 10 hits per batch
-            hits.append({
-                "event_id": start_event + i,
-                "detector": "detector_0",
-                "particle": "gamma",
-                "energy_deposit": random.uniform(0.01, 1.0),
-                "position": {
-                    "x": random.gauss(0, 10),
-                    "y": random.gauss(0, 10),
-                    "z": random.gauss(100, 5)
-                }
-            })
+    ) -> np.ndarray:
+        """
+        Generate sample hit data for demonstration.
+
+        Returned as one float32 block (columns per HIT_SAMPLE_COLUMNS) so
+        orjson serializes the whole batch in a single C call instead of
+        walking per-hit dicts.
+        """
+        n = min(10, batch_size)  # Sample 10 hits per batch
+        hits = np.empty((n, len(HIT_SAMPLE_COLUMNS)), dtype=np.float32)
+        hits[:, 0] = np.arange(start_event, start_event + n)
+        hits[:, 1] = np.random.uniform(0.01, 1.0, n)
+        hits[:, 2] = np.random.normal(0, 10, n)
+        hits[:, 3] = np.random.normal(0, 10, n)
+        hits[:, 4] = np.random.normal(100, 5, n)
         return hits
     
     async def pause_simulation(self, job_id: str) -> bool:
@@ -502,7 +525,7 @@ class SimulationEngine:
         
         job = self.active_simulations[job_id]
         if job.status == SimulationStatus.RUNNING:
-            job.status = SimulationStatus.PAUSED
+            self._set_status(job, SimulationStatus.PAUSED)
             logger.info(f"Paused simulation: {job_id}")
             return True
         return False
@@ -514,7 +537,7 @@ class SimulationEngine:
         
         job = self.active_simulations[job_id]
         if job.status == SimulationStatus.PAUSED:
-            job.status = SimulationStatus.RUNNING
+            self._set_status(job, SimulationStatus.RUNNING)
             logger.info(f"Resumed simulation: {job_id}")
             return True
         return False
@@ -532,7 +555,7 @@ class SimulationEngine:
             proc.terminate()
             del self.simulation_processes[job_id]
         
-        job.status = SimulationStatus.CANCELLED
+        self._set_status(job, SimulationStatus.CANCELLED)
         job.completed_at = datetime.utcnow()
         logger.info(f"Cancelled simulation: {job_id}")
         return True
@@ -540,10 +563,29 @@ class SimulationEngine:
     def get_simulation_status(self, job_id: str) -> Optional[SimulationJob]:
         """Get current simulation status."""
         return self.active_simulations.get(job_id)
+
+    def pop_simulation(self, job_id: str) -> Optional[SimulationJob]:
+        """
+        Remove a simulation in one step and return it, or None if it
+        does not exist. Keeps the status index consistent.
+        """
+        job = self.active_simulations.pop(job_id, None)
+        if job:
+            self._by_status[job.status].discard(job_id)
+        return job
     
-    def list_simulations(self) -> list[SimulationJob]:
-        """List all simulations."""
-        return list(self.active_simulations.values())
+    def list_simulations(
+        self,
+        status: Optional[SimulationStatus] = None
+    ) -> list[SimulationJob]:
+        """List all simulations, optionally filtered by status."""
+        if status is None:
+            return list(self.active_simulations.values())
+        return [
+            self.active_simulations[job_id]
+            for job_id in self._by_status[status]
+            if job_id in self.active_simulations
+        ]
     
     async def get_results(self, job_id: str) -> Optional[SimulationResults]:
         """Get simulation results."""
@@ -575,6 +617,18 @@ class SimulationEngine:
             particle_statistics={}
         )
 
+    async def get_or_load_results(
+        self, job_id: str
+    ) -> Optional[SimulationResults]:
+        """
+        Resolve results with a single call: completed in-engine jobs
+        first, then results saved to disk by the collector.
+        """
+        results = await self.get_results(job_id)
+        if results:
+            return results
+        return result_collector.load_results(job_id)
+
 
 # Global simulation engine instance
 simulation_engine = SimulationEngine()
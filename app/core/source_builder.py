@@ -2,7 +2,8 @@
 Particle source builder for Geant4 primary generators.
 """
 
-from typing import Dict, Optional, List, Any
+from types import MappingProxyType
+from typing import Dict, KeysView, Optional, List, Any
 from loguru import logger
 
 from app.models.particle import (
@@ -22,7 +23,11 @@ class SourceBuilder:
     
     def __init__(self):
         self.sources: Dict[str, ParticleSource] = {}
-    
+        # GPS command lists keyed by the serialized source; exports for
+        # the same (usually template) source are recomputed constantly
+        self._gps_cache: Dict[str, List[str]] = {}
+        self._gps_cache_size = 256
+
     def create_source(self, config: ParticleSource) -> str:
         """Create and store a particle source configuration."""
         source_id = config.name
@@ -34,9 +39,9 @@ class SourceBuilder:
         """Get a stored source configuration."""
         return self.sources.get(source_id)
     
-    def list_sources(self) -> List[str]:
-        """List all stored source IDs."""
-        return list(self.sources.keys())
+    def list_sources(self) -> KeysView[str]:
+        """List all stored source IDs as a lazy dict view."""
+        return self.sources.keys()
     
     def delete_source(self, source_id: str) -> bool:
         """Delete a stored source."""
@@ -48,7 +53,20 @@ class SourceBuilder:
     def to_gps_commands(self, config: ParticleSource) -> List[str]:
         """
         Convert source configuration to GPS macro commands.
+
+        Results are cached by source content, so repeated exports of the
+        same configuration skip the command assembly entirely.
         """
+        key = config.model_dump_json()
+        cached = self._gps_cache.get(key)
+        if cached is None:
+            if len(self._gps_cache) >= self._gps_cache_size:
+                self._gps_cache.pop(next(iter(self._gps_cache)))
+            cached = self._gps_cache[key] = self._build_gps_commands(config)
+        return list(cached)
+
+    def _build_gps_commands(self, config: ParticleSource) -> List[str]:
+        """Assemble the GPS macro commands for a source."""
         commands = [
             "# Particle source configuration",
             f"# Source: {config.name}",
@@ -183,85 +201,19 @@ class SourceBuilder:
     
     def get_particle_info(self, particle: str) -> Dict[str, Any]:
         """Get information about a particle type."""
-        info = {
-            "e-": {
-                "name": "Electron",
-                "pdg": 11,
-                "mass_mev": 0.511,
-                "charge": -1,
-                "lifetime": "stable"
-            },
-            "e+": {
-                "name": "Positron",
-                "pdg": -11,
-                "mass_mev": 0.511,
-                "charge": +1,
-                "lifetime": "stable"
-            },
-            "gamma": {
-                "name": "Gamma (Photon)",
-                "pdg": 22,
-                "mass_mev": 0,
-                "charge": 0,
-                "lifetime": "stable"
-            },
-            "proton": {
-                "name": "Proton",
-                "pdg": 2212,
-                "mass_mev": 938.272,
-                "charge": +1,
-                "lifetime": "stable"
-            },
-            "neutron": {
-                "name": "Neutron",
-                "pdg": 2112,
-                "mass_mev": 939.565,
-                "charge": 0,
-                "lifetime": "881.5 s"
-            },
-            "mu-": {
-                "name": "Muon (negative)",
-                "pdg": 13,
-                "mass_mev": 105.658,
-                "charge": -1,
-                "lifetime": "2.2 µs"
-            },
-            "alpha": {
-                "name": "Alpha particle",
-                "pdg": 1000020040,
-                "mass_mev": 3727.379,
-                "charge": +2,
-                "lifetime": "stable"
-            },
-            "pi+": {
-                "name": "Pion (positive)",
-                "pdg": 211,
-                "mass_mev": 139.570,
-                "charge": +1,
-                "lifetime": "26 ns"
-            },
-            "pi-": {
-                "name": "Pion (negative)",
-                "pdg": -211,
-                "mass_mev": 139.570,
-                "charge": -1,
-                "lifetime": "26 ns"
-            },
-        }
-        
-        return info.get(particle, {
+        return _PARTICLE_INFO.get(particle, {
             "name": particle,
             "pdg": None,
             "mass_mev": None,
             "charge": None,
             "lifetime": "unknown"
         })
-    
+
     def validate_source(self, config: ParticleSource) -> Dict[str, Any]:
         """Validate source configuration."""
         issues = []
         warnings = []
-        
+
         # Check particle type
         known_particles = {p.value for p in ParticleType}
         if config.particle not in known_particles:
@@ -269,29 +221,29 @@ class SourceBuilder:
                 f"Particle '{config.particle}' is not a recognized type. "
                 "Make sure it's a valid Geant4 particle name."
             )
-        
+
         # Check energy
         if config.energy.value <= 0:
             issues.append("Energy must be positive")
-        
+
         if config.energy.value > 1e9:
             warnings.append(
                 f"Very high energy ({config.energy.value} MeV). "
                 "Ensure physics list supports this energy range."
             )
-        
+
         # Check Gaussian distribution
         if config.energy.distribution == EnergyDistribution.GAUSSIAN:
             if not config.energy.sigma:
                 warnings.append("Gaussian energy distribution without sigma specified")
-        
+
         # Check flat distribution
         if config.energy.distribution == EnergyDistribution.FLAT:
             if config.energy.min_energy is None or config.energy.max_energy is None:
                 issues.append(
                     "Flat energy distribution requires min_energy and max_energy"
                 )
-        
+
         # Check direction normalization
         d = config.direction.direction
         mag = (d.x**2 + d.y**2 + d.z**2) ** 0.5
@@ -300,7 +252,7 @@ class SourceBuilder:
                 f"Direction vector ({d.x}, {d.y}, {d.z}) is not normalized "
                 f"(magnitude = {mag:.3f})"
             )
-        
+
         return {
             "valid": len(issues) == 0,
             "issues": issues,
@@ -308,8 +260,77 @@ class SourceBuilder:
         }
 
 
-# Predefined source templates
-SOURCE_TEMPLATES = {
+# Static particle reference data served by get_particle_info
+_PARTICLE_INFO: Dict[str, Dict[str, Any]] = {
+    "e-": {
+        "name": "Electron",
+        "pdg": 11,
+        "mass_mev": 0.511,
+        "charge": -1,
+        "lifetime": "stable"
+    },
+    "e+": {
+        "name": "Positron",
+        "pdg": -11,
+        "mass_mev": 0.511,
+        "charge": +1,
+        "lifetime": "stable"
+    },
+    "gamma": {
+        "name": "Gamma (Photon)",
+        "pdg": 22,
+        "mass_mev": 0,
+        "charge": 0,
+        "lifetime": "stable"
+    },
+    "proton": {
+        "name": "Proton",
+        "pdg": 2212,
+        "mass_mev": 938.272,
+        "charge": +1,
+        "lifetime": "stable"
+    },
+    "neutron": {
+        "name": "Neutron",
+        "pdg": 2112,
+        "mass_mev": 939.565,
+        "charge": 0,
+        "lifetime": "881.5 s"
+    },
+    "mu-": {
+        "name": "Muon (negative)",
+        "pdg": 13,
+        "mass_mev": 105.658,
+        "charge": -1,
+        "lifetime": "2.2 µs"
+    },
+    "alpha": {
+        "name": "Alpha particle",
+        "pdg": 1000020040,
+        "mass_mev": 3727.379,
+        "charge": +2,
+        "lifetime": "stable"
+    },
+    "pi+": {
+        "name": "Pion (positive)",
+        "pdg": 211,
+        "mass_mev": 139.570,
+        "charge": +1,
+        "lifetime": "26 ns"
+    },
+    "pi-": {
+        "name": "Pion (negative)",
+        "pdg": -211,
+        "mass_mev": 139.570,
+        "charge": -1,
+        "lifetime": "26 ns"
+    },
+}
+
+
+# Predefined source templates; read-only so handlers cannot swap or
+# delete entries
+SOURCE_TEMPLATES = MappingProxyType({
     "gamma_1mev": ParticleSource(
         name="gamma_1mev",
         particle="gamma",
@@ -395,7 +416,7 @@ SOURCE_TEMPLATES = {
             center=Vector3D(x=0, y=0, z=0)
         )
     )
-}
+})
 
 
 # Global source builder instance
@@ -6,16 +6,19 @@ A FastAPI-based REST API wrapper for Geant4 Monte Carlo simulations
 with WebSocket support for real-time data streaming.
 """
 
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from loguru import logger
 import sys
 
 from app.config import settings, setup_geant4_environment
 from app.api import api_router
+from app.api.websocket import heartbeat_loop
 
 
 # Configure logging
@@ -37,13 +40,37 @@ async def lifespan(app: FastAPI):
     logger.info("Starting Geant4 API server...")
     setup_geant4_environment()
     logger.info(f"Results directory: {settings.results_path}")
-    
+
+    # One shared heartbeat timer for all WebSocket clients
+    heartbeat = asyncio.create_task(heartbeat_loop())
+
     yield
-    
+
     # Shutdown
+    heartbeat.cancel()
     logger.info("Shutting down Geant4 API server...")
 
 
+class TrailingSlashMiddleware:
+    """
+    Strip trailing slashes before routing.
+
+    Lets each collection endpoint register a single route (instead of
+    the old ""/"/" double registration) while still serving both forms
+    without a 307 redirect.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            path = scope["path"]
+            if len(path) > 1 and path.endswith("/"):
+                scope["path"] = path.rstrip("/")
+        await self.app(scope, receive, send)
+
+
 # Create FastAPI application
 app = FastAPI(
     title="Geant4 Real-Time API",
@@ -76,6 +103,7 @@ Connect to `/ws/simulations/{simulation_id}` for real-time updates.
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,  # C JSON encoder on every route
     lifespan=lifespan
 )
 
@@ -88,6 +116,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large JSON/CSV responses (hit exports are highly repetitive
+# and compress well); small payloads are sent as-is
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+# Normalize trailing slashes so routes only register once
+app.add_middleware(TrailingSlashMiddleware)
+
 # Include API routes
 app.include_router(api_router, prefix="/api/v1")
 
@@ -2,8 +2,10 @@
 Geometry models for detector construction.
 """
 
+import sys
+from functools import cached_property
 from typing import Optional, List, Literal, Union
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from enum import Enum
 
 
@@ -30,6 +32,8 @@ class MaterialType(str, Enum):
 
 class Vector3D(BaseModel):
     """3D vector for positions and dimensions."""
+    model_config = ConfigDict(frozen=True)
+
     x: float = Field(default=0.0, description="X component (mm)")
     y: float = Field(default=0.0, description="Y component (mm)")
     z: float = Field(default=0.0, description="Z component (mm)")
@@ -37,6 +41,8 @@ class Vector3D(BaseModel):
 
 class Rotation3D(BaseModel):
     """3D rotation angles."""
+    model_config = ConfigDict(frozen=True)
+
     x: float = Field(default=0.0, description="Rotation around X (degrees)")
     y: float = Field(default=0.0, description="Rotation around Y (degrees)")
     z: float = Field(default=0.0, description="Rotation around Z (degrees)")
@@ -44,14 +50,33 @@ class Rotation3D(BaseModel):
 
 class BoxGeometry(BaseModel):
     """Box-shaped solid geometry."""
+    model_config = ConfigDict(frozen=True)
+
     type: Literal["box"] = "box"
     half_x: float = Field(..., description="Half-length in X (mm)")
     half_y: float = Field(..., description="Half-length in Y (mm)")
     half_z: float = Field(..., description="Half-length in Z (mm)")
 
+    @cached_property
+    def full_x(self) -> float:
+        """Full length in X (mm)."""
+        return self.half_x * 2
+
+    @cached_property
+    def full_y(self) -> float:
+        """Full length in Y (mm)."""
+        return self.half_y * 2
+
+    @cached_property
+    def full_z(self) -> float:
+        """Full length in Z (mm)."""
+        return self.half_z * 2
+
 
 class CylinderGeometry(BaseModel):
     """Cylindrical solid geometry."""
+    model_config = ConfigDict(frozen=True)
+
     type: Literal["cylinder"] = "cylinder"
     inner_radius: float = Field(default=0.0, description="Inner radius (mm)")
     outer_radius: float = Field(..., description="Outer radius (mm)")
@@ -59,9 +84,16 @@ class CylinderGeometry(BaseModel):
     start_phi: float = Field(default=0.0, description="Start angle (degrees)")
     delta_phi: float = Field(default=360.0, description="Angular span (degrees)")
 
+    @cached_property
+    def full_z(self) -> float:
+        """Full length in Z (mm)."""
+        return self.half_z * 2
+
 
 class SphereGeometry(BaseModel):
     """Spherical solid geometry."""
+    model_config = ConfigDict(frozen=True)
+
     type: Literal["sphere"] = "sphere"
     inner_radius: float = Field(default=0.0, description="Inner radius (mm)")
     outer_radius: float = Field(..., description="Outer radius (mm)")
@@ -73,6 +105,8 @@ class SphereGeometry(BaseModel):
 
 class ConeGeometry(BaseModel):
     """Conical solid geometry."""
+    model_config = ConfigDict(frozen=True)
+
     type: Literal["cone"] = "cone"
     inner_radius_1: float = Field(default=0.0, description="Inner radius at -z (mm)")
     outer_radius_1: float = Field(..., description="Outer radius at -z (mm)")
@@ -80,12 +114,19 @@ class ConeGeometry(BaseModel):
     outer_radius_2: float = Field(..., description="Outer radius at +z (mm)")
     half_z: float = Field(..., description="Half-length in Z (mm)")
 
+    @cached_property
+    def full_z(self) -> float:
+        """Full length in Z (mm)."""
+        return self.half_z * 2
+
 
 SolidGeometry = Union[BoxGeometry, CylinderGeometry, SphereGeometry, ConeGeometry]
 
 
 class Volume(BaseModel):
     """A detector volume with geometry, material, and placement."""
+    model_config = ConfigDict(frozen=True)
+
     name: str = Field(..., description="Unique volume name")
     solid: SolidGeometry = Field(..., description="Solid geometry definition")
     material: str = Field(..., description="Material name (e.g., G4_WATER)")
@@ -97,18 +138,49 @@ class Volume(BaseModel):
         description="RGBA color [r, g, b, a] for visualization"
     )
     children: List["Volume"] = Field(
-        default_factory=list, 
+        default_factory=list,
         description="Child volumes"
     )
 
+    @field_validator("material")
+    @classmethod
+    def _intern_material(cls, value: str) -> str:
+        # Materials come from a small vocabulary repeated across many
+        # volumes; interning makes later membership tests hit the
+        # identity fast path instead of comparing characters
+        return sys.intern(value)
+
+    @cached_property
+    def has_rotation(self) -> bool:
+        """Whether the volume has a non-identity rotation."""
+        rotation = self.rotation
+        return bool(rotation.x or rotation.y or rotation.z)
+
 
 class WorldVolume(BaseModel):
     """The world volume containing the entire geometry."""
+    model_config = ConfigDict(frozen=True)
+
     half_x: float = Field(default=1000.0, description="World half-X (mm)")
     half_y: float = Field(default=1000.0, description="World half-Y (mm)")
     half_z: float = Field(default=1000.0, description="World half-Z (mm)")
     material: str = Field(default="G4_AIR", description="World material")
 
+    @cached_property
+    def full_x(self) -> float:
+        """Full world extent in X (mm)."""
+        return self.half_x * 2
+
+    @cached_property
+    def full_y(self) -> float:
+        """Full world extent in Y (mm)."""
+        return self.half_y * 2
+
+    @cached_property
+    def full_z(self) -> float:
+        """Full world extent in Z (mm)."""
+        return self.half_z * 2
+
 
 class DetectorGeometry(BaseModel):
     """Complete detector geometry configuration."""
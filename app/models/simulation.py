@@ -156,6 +156,10 @@ class SimulationJob(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
+
+    # Monotonic clock reading taken when the job started; used for
+    # elapsed-time math on the progress hot path (not part of the API)
+    started_monotonic: Optional[float] = Field(default=None, exclude=True)
     
     # Configuration references
     config: SimulationConfig